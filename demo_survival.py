@@ -77,13 +77,8 @@ def run_survival_demo(num_agents=20, num_predators=5, num_ticks=100, initial_ene
             avg_final_energy = sum(a.state.energy for a in alive_agents) / len(alive_agents)
             print(f"✓ Survivors maintained energy: {avg_final_energy:.1f} average")
             
-            total_decisions = sum(len(a.decision_history) for a in alive_agents)
-            flee_decisions = sum(
-                1 for a in alive_agents 
-                for d in a.decision_history 
-                if "flee" in d.get("action", "").lower() or 
-                   d.get("action") in ["MOVE_NORTH", "MOVE_SOUTH", "MOVE_EAST", "MOVE_WEST"]
-            )
+            total_decisions = sum(a.decision_count for a in alive_agents)
+            flee_decisions = sum(a.movement_count for a in alive_agents)
             print(f"✓ Movement decisions: {flee_decisions}/{total_decisions} "
                   f"({100*flee_decisions/total_decisions:.1f}%)")
         else:
@@ -1,5 +1,5 @@
 from interfaces.ui_iface.runner.agent_api import get_agent_grid
-import random
+import numpy as np
 
 class SimpleAgent:
     def __init__(self, x, y, env):
@@ -10,13 +10,7 @@ class SimpleAgent:
     def step(self):
         nbr = self.env.get_neighborhood(self.x, self.y, radius=1)
         hydration = nbr['hydration']
-        best_y, best_x = 0, 0
-        best_water = -float('inf')
-        for dy in range(hydration.shape[0]):
-            for dx in range(hydration.shape[1]):
-                if hydration[dy, dx] > best_water:
-                    best_water = hydration[dy, dx]
-                    best_y, best_x = dy, dx
+        best_y, best_x = np.unravel_index(np.argmax(hydration), hydration.shape)
         offset_y = best_y - 1
         offset_x = best_x - 1
         self.y = max(0, min(self.env.h - 1, self.y + offset_y))
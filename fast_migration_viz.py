@@ -10,6 +10,7 @@ matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
 from interfaces.agent_iface.banded_agent import BandedAgent
+from interfaces.agent_iface.band_physiological import gather_windows
 from interfaces.ui_iface.runner.engine import load_scenario, run_headless
 from interfaces.ui_iface.runner.hydrator import hydrate_tick
 from interfaces.ui_iface.runner.predators import PredatorSystem
@@ -31,6 +32,23 @@ class FastStaticSimulation:
         self.predators.threat_field = np.zeros((world_height, world_width), dtype=np.float32)
         self.current_tick = 0
         self.rng = np.random.default_rng(seed)
+        # Edge-padded grids so every agent's neighborhood is one gather into the window buffers
+        self.radius = 2
+        self.veg_pad = np.pad(vegetation, self.radius, mode='edge')
+        self.hyd_pad = np.pad(hydration, self.radius, mode='edge')
+        self.threat_radius = 3
+        self.threat_dy, self.threat_dx = np.mgrid[-self.threat_radius:self.threat_radius+1,
+                                                  -self.threat_radius:self.threat_radius+1]
+        self.xs = np.empty(0, dtype=np.intp)
+        self.ys = np.empty(0, dtype=np.intp)
+        self.alive_mask = np.empty(0, dtype=np.bool_)
+        self._alloc_windows(0)
+    
+    def _alloc_windows(self, n):
+        """Per-agent vegetation/hydration window buffers, refilled in place every tick."""
+        size = 2 * self.radius + 1
+        self.veg_windows = np.empty((n, size, size), dtype=self.veg_pad.dtype)
+        self.hyd_windows = np.empty((n, size, size), dtype=self.hyd_pad.dtype)
     
     def spawn_agents(self, num_agents, initial_energy=50.0):
         """Spawn agents at random positions."""
@@ -40,29 +58,39 @@ class FastStaticSimulation:
             agent = BandedAgent(agent_id=i, x=x, y=y, initial_energy=initial_energy, 
                                seed=self.rng.integers(0, 1000000))
             self.agents.append(agent)
+        self._sync_columns()
+    
+    def _sync_columns(self):
+        """Extend the position/liveness columns with agents appended to self.agents since the last sync."""
+        new = self.agents[len(self.xs):]
+        if not new:
+            return
+        self.xs = np.concatenate([self.xs, np.array([a.state.x for a in new], dtype=np.intp)])
+        self.ys = np.concatenate([self.ys, np.array([a.state.y for a in new], dtype=np.intp)])
+        self.alive_mask = np.concatenate([self.alive_mask, np.array([a.state.alive for a in new], dtype=np.bool_)])
+        self._alloc_windows(len(self.agents))
+    
+    def _gather_neighborhoods(self, xs, ys):
+        """Gather (N, 2r+1, 2r+1) vegetation/hydration patches for all positions at once."""
+        return (gather_windows(self.veg_pad, xs, ys, self.radius, self.veg_windows),
+                gather_windows(self.hyd_pad, xs, ys, self.radius, self.hyd_windows))
     
-    def _get_env_state(self, agent):
+    def _sample_threat(self, xs, ys):
+        """Sample (N, 2r+1, 2r+1) edge-clamped threat windows for all positions."""
+        field = self.predators.threat_field
+        rows = np.clip(ys[:, None, None] + self.threat_dy, 0, self.world_height - 1)
+        cols = np.clip(xs[:, None, None] + self.threat_dx, 0, self.world_width - 1)
+        return field[rows, cols]
+    
+    def _get_env_state(self, temperature, neighborhood_veg, neighborhood_hyd, neighborhood_threat):
         """Get static environment state at agent position with neighborhood."""
-        x, y = agent.state.x, agent.state.y
-        
-        # Get neighborhood (5x5 centered on agent)
-        radius = 2
-        y_min, y_max = max(0, y-radius), min(self.world_height, y+radius+1)
-        x_min, x_max = max(0, x-radius), min(self.world_width, x+radius+1)
-        
-        neighborhood_veg = self.vegetation[y_min:y_max, x_min:x_max]
-        neighborhood_hyd = self.hydration[y_min:y_max, x_min:x_max]
-        
-        # Get threat
-        local_threat = self.predators.get_threat_at(x, y)
-        neighborhood_threat = self.predators.get_local_threat(x, y, radius=3)
-        
+        r, tr = self.radius, self.threat_radius
         return {
-            "temperature": float(self.temperature[y, x]),
-            "hydration": float(self.hydration[y, x]),
-            "vegetation": float(self.vegetation[y, x]),
+            "temperature": temperature,
+            "hydration": neighborhood_hyd[r, r].item(),
+            "vegetation": neighborhood_veg[r, r].item(),
             "movement_cost": 0.0,
-            "threat": local_threat,
+            "threat": neighborhood_threat[tr, tr].item(),
             "neighborhood_threat": neighborhood_threat,
             "neighborhood_vegetation": neighborhood_veg,
             "neighborhood_hydration": neighborhood_hyd
@@ -70,21 +98,35 @@ class FastStaticSimulation:
     
     def step(self):
         """Execute one tick - fast, no disk I/O."""
-        alive_agents = [a for a in self.agents if a.state.alive]
-        agent_positions = [(a.state.x, a.state.y) for a in alive_agents]
+        # Scripts also add agents with sim.agents.append, so pick those up before stepping
+        if len(self.agents) != len(self.xs):
+            self._sync_columns()
+        alive_idx = np.flatnonzero(self.alive_mask)
+        xs, ys = self.xs[alive_idx], self.ys[alive_idx]
         
         # Update predators
-        self.predators.update(agent_positions, self.current_tick)
+        self.predators.update(list(zip(xs.tolist(), ys.tolist())), self.current_tick)
+        
+        # Neighborhoods (5x5 vegetation/hydration, 7x7 threat, edge-clamped) for every agent in one gather each
+        veg, hyd = self._gather_neighborhoods(xs, ys)
+        threat = self._sample_threat(xs, ys)
+        temps = self.temperature[ys, xs].tolist()
         
-        # Update each agent
-        for agent in alive_agents:
-            env_state = self._get_env_state(agent)
+        # Update each agent, writing its new position/liveness back into the columns
+        for i, k in enumerate(alive_idx.tolist()):
+            agent = self.agents[k]
+            env_state = self._get_env_state(temps[i], veg[i], hyd[i], threat[i])
             agent.step(env_state, self.world_width, self.world_height)
+            self.xs[k], self.ys[k] = agent.state.x, agent.state.y
+            self.alive_mask[k] = agent.state.alive
         
         # Check predation
-        caught = self.predators.check_predation([(a.state.x, a.state.y) for a in alive_agents])
-        for idx in caught:
-            alive_agents[idx].handle_predation()
+        xs, ys = self.xs[alive_idx], self.ys[alive_idx]
+        caught = self.predators.check_predation(list(zip(xs.tolist(), ys.tolist())))
+        for i in caught:
+            agent = self.agents[alive_idx[i]]
+            agent.handle_predation()
+            self.alive_mask[alive_idx[i]] = agent.state.alive
         
         self.current_tick += 1
 
@@ -112,27 +154,28 @@ def create_fast_visualization(num_agents=40, num_ticks=100, num_predators=2,
         sim.spawn_agents(num_agents, initial_energy)
         
         # Record initial state
-        initial_pos = [(a.state.x, a.state.y) for a in sim.agents]
-        initial_energy = [a.state.energy for a in sim.agents]
-        trajectories = [[(a.state.x, a.state.y)] for a in sim.agents]
+        initial_pos = np.array([(a.state.x, a.state.y) for a in sim.agents], dtype=np.intp).reshape(-1, 2)
+        initial_energy = np.array([a.state.energy for a in sim.agents])
+        # Dead agents stop moving, so their rows simply repeat the last position
+        trajectories = np.empty((len(sim.agents), num_ticks + 1, 2), dtype=np.int32)
+        trajectories[:, 0] = initial_pos
         
         # Run simulation
         for tick in range(num_ticks):
             sim.step()
-            for i, agent in enumerate(sim.agents):
-                if agent.state.alive:
-                    trajectories[i].append((agent.state.x, agent.state.y))
+            trajectories[:, tick + 1, 0] = sim.xs
+            trajectories[:, tick + 1, 1] = sim.ys
             
             if tick % 20 == 0:
-                alive = sum(1 for a in sim.agents if a.state.alive)
+                alive = int(sim.alive_mask.sum())
                 print(f'  Tick {tick}: {alive}/{num_agents} alive')
         
         # Record final state
-        final_pos = [(a.state.x, a.state.y) for a in sim.agents if a.state.alive]
-        final_energy = [a.state.energy for a in sim.agents if a.state.alive]
+        final_pos = np.array([(a.state.x, a.state.y) for a in sim.agents if a.state.alive], dtype=np.intp).reshape(-1, 2)
+        final_energy = np.array([a.state.energy for a in sim.agents if a.state.alive])
         
-        initial_veg = [vegetation[y, x] for x, y in initial_pos]
-        final_veg = [vegetation[y, x] for x, y in final_pos]
+        initial_veg = vegetation[initial_pos[:, 1], initial_pos[:, 0]]
+        final_veg = vegetation[final_pos[:, 1], final_pos[:, 0]]
         
         print('\nCreating visualization...')
         fig = plt.figure(figsize=(20, 6))
@@ -140,7 +183,7 @@ def create_fast_visualization(num_agents=40, num_ticks=100, num_predators=2,
         # Panel 1: Initial positions
         ax1 = plt.subplot(1, 4, 1)
         ax1.imshow(vegetation, cmap='Greens', origin='upper', vmin=0, vmax=0.8, alpha=0.9)
-        ax1.scatter([p[0] for p in initial_pos], [p[1] for p in initial_pos],
+        ax1.scatter(initial_pos[:, 0], initial_pos[:, 1],
                    c=initial_energy, cmap='RdYlGn', s=80, edgecolors='black',
                    vmin=0, vmax=100, linewidth=1.5)
         ax1.set_title(f'Initial (t=0)\nμ_veg={np.mean(initial_veg):.3f}', 
@@ -154,11 +197,9 @@ def create_fast_visualization(num_agents=40, num_ticks=100, num_predators=2,
         
         # Draw trajectories
         for traj in trajectories:
-            if len(traj) > 1:
-                xs, ys = zip(*traj)
-                ax2.plot(xs, ys, 'gray', alpha=0.3, linewidth=0.5)
+            ax2.plot(traj[:, 0], traj[:, 1], 'gray', alpha=0.3, linewidth=0.5)
         
-        ax2.scatter([p[0] for p in final_pos], [p[1] for p in final_pos],
+        ax2.scatter(final_pos[:, 0], final_pos[:, 1],
                    c=final_energy, cmap='RdYlGn', s=80, edgecolors='black',
                    vmin=0, vmax=100, linewidth=1.5)
         ax2.set_title(f'Final (t={num_ticks})\nμ_veg={np.mean(final_veg):.3f}', 
@@ -185,15 +226,13 @@ def create_fast_visualization(num_agents=40, num_ticks=100, num_predators=2,
         ax4 = plt.subplot(1, 4, 4)
         ax4.imshow(vegetation, cmap='Greens', origin='upper', vmin=0, vmax=0.8, alpha=0.9)
         
-        for i, (init, final) in enumerate(zip(initial_pos, final_pos)):
-            dx = final[0] - init[0]
-            dy = final[1] - init[1]
-            init_v = vegetation[init[1], init[0]]
-            final_v = vegetation[final[1], final[0]]
-            color = 'green' if final_v > init_v else 'red'
-            ax4.arrow(init[0], init[1], dx*0.8, dy*0.8, 
-                     head_width=2, head_length=2, fc=color, ec=color, 
-                     alpha=0.5, linewidth=1)
+        # Last recorded position per agent keeps arrows aligned by agent (pre-death for the dead)
+        last_pos = trajectories[:, -1]
+        move = last_pos - initial_pos
+        improved = vegetation[last_pos[:, 1], last_pos[:, 0]] > initial_veg
+        ax4.quiver(initial_pos[:, 0], initial_pos[:, 1], move[:, 0] * 0.8, move[:, 1] * 0.8,
+                   color=np.where(improved, 'green', 'red'), alpha=0.5,
+                   angles='xy', scale_units='xy', scale=1, width=0.004)
         
         ax4.set_title('Net Movement\n(green=toward food)', fontsize=13, fontweight='bold')
         ax4.set_xlabel('X')
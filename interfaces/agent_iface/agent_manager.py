@@ -1,12 +1,54 @@
 import numpy as np
 import json
 import os
+from numba import njit
 from typing import List, Dict, Any
-from .base_agent import BaseAgent, AgentState
-from ..ui_iface.runner.agent_api import EnvironmentGrid
+from .base_agent import BaseAgent, AgentState, Action, ACTION_DX, ACTION_DY
+from ..ui_iface.runner.agent_api import EnvironmentGrid, TickPrefetcher
+
+@njit(cache=True)
+def masked_population_moments(energies, xs, ys, mask):
+    """Single pass over the alive slots: (count, mean_e, std_e, min_e, max_e, mean_x, mean_y)."""
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    mn = np.inf
+    mx = -np.inf
+    sx = 0.0
+    sy = 0.0
+    for i in range(energies.shape[0]):
+        if mask[i]:
+            v = energies[i]
+            n += 1
+            # Welford update: stays exact (std 0.0) for uniform populations
+            delta = v - mean
+            mean += delta / n
+            m2 += delta * (v - mean)
+            if v < mn:
+                mn = v
+            if v > mx:
+                mx = v
+            sx += xs[i]
+            sy += ys[i]
+    if n == 0:
+        return 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+    return n, mean, np.sqrt(m2 / n), mn, mx, sx / n, sy / n
+
+_BASE_HOOKS = ("step", "act", "execute_action", "update_energy", "_compute_energy_cost")
+_hooks_cache: Dict[type, bool] = {}
+
+def _keeps_base_hooks(cls) -> bool:
+    """True when cls inherits BaseAgent's move/energy hooks, so its tick can run over the columns."""
+    keeps = _hooks_cache.get(cls)
+    if keeps is None:
+        keeps = issubclass(cls, BaseAgent) and all(
+            getattr(cls, name) is getattr(BaseAgent, name) for name in _BASE_HOOKS
+        )
+        _hooks_cache[cls] = keeps
+    return keeps
 
 class AgentManager:
-    def __init__(self, run_dir: str, seed: int = 42):
+    def __init__(self, run_dir: str, seed: int = 42, record_trajectories: bool = False):
         self.run_dir = run_dir
         self.env = EnvironmentGrid(run_dir)
         self.agents: List[BaseAgent] = []
@@ -14,39 +56,173 @@ class AgentManager:
         self.current_tick = 0
         self.world_width = self.env.w
         self.world_height = self.env.h
+        self.prefetcher: TickPrefetcher = None
+        self.xs = np.empty(0, dtype=np.int32)
+        self.ys = np.empty(0, dtype=np.int32)
+        self.energies = np.empty(0, dtype=np.float64)
+        self.alive = np.empty(0, dtype=np.bool_)
+        
+        # Per-tick (ticks, agents) trajectory buffers, only filled when record_trajectories is set
+        self.record_trajectories = record_trajectories
+        self.recorded_ticks = 0
+        self.first_recorded_tick = 0
+        self.position_log = np.empty((0, 0, 2), dtype=np.int32)
+        self.energy_log = np.empty((0, 0), dtype=np.float64)
+        self.alive_log = np.empty((0, 0), dtype=np.bool_)
         
     def add_agent(self, agent: BaseAgent):
         self.agents.append(agent)
+        self._grow_columns(1)
+        self._store_state(len(self.agents) - 1, agent)
+    
+    def _grow_columns(self, n: int):
+        self.xs = np.concatenate([self.xs, np.zeros(n, dtype=np.int32)])
+        self.ys = np.concatenate([self.ys, np.zeros(n, dtype=np.int32)])
+        self.energies = np.concatenate([self.energies, np.zeros(n, dtype=np.float64)])
+        self.alive = np.concatenate([self.alive, np.zeros(n, dtype=np.bool_)])
+    
+    def _load_columns(self):
+        """Refill the columns from every agent's state, growing them for agents appended directly."""
+        n = len(self.agents)
+        if n > self.xs.size:
+            self._grow_columns(n - self.xs.size)
+        states = [agent.state for agent in self.agents]
+        self.xs[:] = np.fromiter((s.x for s in states), dtype=np.int32, count=n)
+        self.ys[:] = np.fromiter((s.y for s in states), dtype=np.int32, count=n)
+        self.energies[:] = np.fromiter((s.energy for s in states), dtype=np.float64, count=n)
+        self.alive[:] = np.fromiter((s.alive for s in states), dtype=np.bool_, count=n)
+    
+    def _store_state(self, i: int, agent: BaseAgent):
+        state = agent.state
+        self.xs[i] = state.x
+        self.ys[i] = state.y
+        self.energies[i] = state.energy
+        self.alive[i] = state.alive
     
     def spawn_agents(self, agent_class, num_agents: int, initial_energy: float = 100.0, agent_seed_base: int = 1000):
-        for i in range(num_agents):
-            x = self.rng.integers(0, self.world_width)
-            y = self.rng.integers(0, self.world_height)
-            agent_seed = agent_seed_base + i
+        start = len(self.agents)
+        self._grow_columns(num_agents)
+        xs = self.rng.integers(0, self.world_width, size=num_agents)
+        ys = self.rng.integers(0, self.world_height, size=num_agents)
+        self.xs[start:] = xs
+        self.ys[start:] = ys
+        self.energies[start:] = initial_energy
+        self.alive[start:] = True
+        for i, (x, y) in enumerate(zip(xs.tolist(), ys.tolist())):
             agent = agent_class(
                 agent_id=i,
                 x=x,
                 y=y,
                 initial_energy=initial_energy,
-                seed=agent_seed
+                seed=agent_seed_base + i
             )
-            self.add_agent(agent)
+            self.agents.append(agent)
     
     def step(self):
-        self.env.load_tick(self.current_tick)
+        if self.prefetcher is not None:
+            self.env.load_tick(self.current_tick, self.prefetcher.get(self.current_tick))
+        else:
+            self.env.load_tick(self.current_tick)
         
-        for agent in self.agents:
-            if agent.state.alive:
-                agent.step(self.env, self.world_width, self.world_height)
+        # agent.state stays authoritative: pick up appended agents and any outside edits
+        self._load_columns()
+        agents = self.agents
+        alive_idx = np.flatnonzero(self.alive)
+        batched = np.fromiter((_keeps_base_hooks(type(agents[i])) for i in alive_idx.tolist()),
+                              dtype=np.bool_, count=alive_idx.size)
+        for i in alive_idx[~batched].tolist():
+            agents[i].step(self.env, self.world_width, self.world_height)
+            self._store_state(i, agents[i])
+        alive_idx = alive_idx[batched]
+        if alive_idx.size:
+            # Positions the agents perceived from, before this tick's moves
+            xs, ys = self.xs[alive_idx], self.ys[alive_idx]
+            actions = np.empty(alive_idx.size, dtype=np.intp)
+            for k, i in enumerate(alive_idx.tolist()):
+                action, _ = agents[i].choose(self.env)
+                actions[k] = action.value
+            self.xs[alive_idx] = (xs + ACTION_DX[actions]) % self.world_width
+            self.ys[alive_idx] = (ys + ACTION_DY[actions]) % self.world_height
+            self._apply_energy_costs(alive_idx, xs, ys, actions == Action.STAY.value)
         
+        if self.record_trajectories:
+            self._record_tick()
         self.current_tick += 1
     
+    def _apply_energy_costs(self, alive_idx: np.ndarray, xs: np.ndarray, ys: np.ndarray,
+                            stayed: np.ndarray):
+        """
+        BaseAgent._compute_energy_cost and update_energy for every batched agent at once:
+        -1 per tick, -2 * movement_cost unless staying, +5 * vegetation, read at the
+        perceived cells. Results and the moved positions are written back to the agents' states.
+        """
+        tensor = self.env.tensor
+        indices = self.env.registry["indices"]
+        cost = np.full(alive_idx.size, -1.0)
+        if "movement_cost" in indices:
+            movement_cost = tensor[ys, xs, indices["movement_cost"]].astype(np.float64)
+            cost += np.where(stayed, 0.0, -2.0 * movement_cost)
+        cost += 5.0 * tensor[ys, xs, indices["vegetation"]].astype(np.float64)
+        
+        energies = self.energies[alive_idx] + cost
+        alive = energies > 0
+        energies[~alive] = 0.0
+        self.energies[alive_idx] = energies
+        self.alive[alive_idx] = alive
+        
+        agents = self.agents
+        for i, x, y, energy, is_alive in zip(alive_idx.tolist(), self.xs[alive_idx].tolist(),
+                                             self.ys[alive_idx].tolist(), energies.tolist(), alive.tolist()):
+            state = agents[i].state
+            state.x = x
+            state.y = y
+            state.energy = energy
+            state.alive = is_alive
+            state.tick += 1
+    
+    def _reserve_trajectory(self, ticks: int):
+        """Size the trajectory buffers for `ticks` recorded ticks of the current population."""
+        t, n = self.energy_log.shape
+        n_agents = len(self.agents)
+        if ticks <= t and n_agents <= n:
+            return
+        ticks, n_agents = max(ticks, t), max(n_agents, n)
+        positions = np.full((ticks, n_agents, 2), -1, dtype=np.int32)
+        energies = np.full((ticks, n_agents), np.nan, dtype=np.float64)
+        alive = np.zeros((ticks, n_agents), dtype=np.bool_)
+        k = self.recorded_ticks
+        positions[:k, :n] = self.position_log[:k]
+        energies[:k, :n] = self.energy_log[:k]
+        alive[:k, :n] = self.alive_log[:k]
+        self.position_log, self.energy_log, self.alive_log = positions, energies, alive
+    
+    def _record_tick(self):
+        k = self.recorded_ticks
+        if k == 0:
+            self.first_recorded_tick = self.current_tick
+        if k >= self.energy_log.shape[0] or len(self.agents) > self.energy_log.shape[1]:
+            self._reserve_trajectory(max(2 * k, 16))
+        n = len(self.agents)
+        self.position_log[k, :n, 0] = self.xs
+        self.position_log[k, :n, 1] = self.ys
+        self.energy_log[k, :n] = self.energies
+        self.alive_log[k, :n] = self.alive
+        self.recorded_ticks = k + 1
+    
     def run_simulation(self, num_ticks: int):
-        for _ in range(num_ticks):
-            self.step()
+        if self.record_trajectories:
+            self._reserve_trajectory(self.recorded_ticks + num_ticks)
+        self.prefetcher = TickPrefetcher(self.run_dir, self.current_tick, self.current_tick + num_ticks)
+        try:
+            for _ in range(num_ticks):
+                self.step()
+        finally:
+            self.prefetcher.close()
+            self.prefetcher = None
     
     def get_alive_count(self) -> int:
-        return sum(1 for agent in self.agents if agent.state.alive)
+        self._load_columns()
+        return int(self.alive.sum())
     
     def get_agent_states(self) -> List[Dict[str, Any]]:
         return [agent.state.to_dict() for agent in self.agents]
@@ -63,10 +239,34 @@ class AgentManager:
         with open(output_path, 'w') as f:
             json.dump(trajectories, f, indent=2)
     
+    def save_trajectories_npz(self, output_path: str):
+        """Save per-tick positions/energies/alive flags as compressed (ticks, agents) arrays.
+        
+        Requires record_trajectories=True. Agents added mid-run are padded with x=y=-1,
+        energy=nan, alive=False before they existed.
+        """
+        if not self.record_trajectories:
+            raise ValueError("save_trajectories_npz requires AgentManager(record_trajectories=True)")
+        
+        t = self.recorded_ticks
+        n = len(self.agents)
+        self._reserve_trajectory(t)
+        np.savez_compressed(
+            output_path,
+            agent_ids=np.array([a.state.agent_id for a in self.agents], dtype=np.int32),
+            ticks=np.arange(self.first_recorded_tick, self.first_recorded_tick + t, dtype=np.int32),
+            positions=self.position_log[:t, :n],
+            energies=self.energy_log[:t, :n],
+            alive=self.alive_log[:t, :n]
+        )
+    
     def get_population_stats(self) -> Dict[str, Any]:
-        alive_agents = [a for a in self.agents if a.state.alive]
+        self._load_columns()
+        n, mean_e, std_e, min_e, max_e, mean_x, mean_y = masked_population_moments(
+            self.energies, self.xs, self.ys, self.alive
+        )
         
-        if not alive_agents:
+        if n == 0:
             return {
                 "tick": self.current_tick,
                 "alive_count": 0,
@@ -76,19 +276,15 @@ class AgentManager:
                 "mean_y": 0.0
             }
         
-        energies = [a.state.energy for a in alive_agents]
-        positions_x = [a.state.x for a in alive_agents]
-        positions_y = [a.state.y for a in alive_agents]
-        
         return {
             "tick": self.current_tick,
-            "alive_count": len(alive_agents),
-            "mean_energy": float(np.mean(energies)),
-            "std_energy": float(np.std(energies)),
-            "mean_x": float(np.mean(positions_x)),
-            "mean_y": float(np.mean(positions_y)),
-            "min_energy": float(np.min(energies)),
-            "max_energy": float(np.max(energies))
+            "alive_count": n,
+            "mean_energy": mean_e,
+            "std_energy": std_e,
+            "mean_x": mean_x,
+            "mean_y": mean_y,
+            "min_energy": min_e,
+            "max_energy": max_e
         }
     
     def save_population_stats(self, output_path: str):
@@ -100,7 +296,7 @@ class AgentManager:
                     "tick": tick,
                     "agent_id": agent.state.agent_id,
                     "alive": tick < len(agent.action_history),
-                    "energy": agent.perception_history[tick].to_dict() if tick < len(agent.perception_history) else None
+                    "energy": agent.perception_history[tick] if tick < len(agent.perception_history) else None
                 })
         
         with open(output_path, 'w') as f:
@@ -1,7 +1,45 @@
 import numpy as np
+from collections import Counter
+from numba import njit
 from typing import List, Optional
 from .band import Band, Action, ActionProposal
 
+@njit(cache=True)
+def _arbitrate(urgencies, band_ids, prev_band, inertia, inv_temperature, u):
+    """Inertia boost, stable softmax and inverse-CDF draw over one tick's proposals; returns the index."""
+    n = urgencies.shape[0]
+    for i in range(n):
+        if band_ids[i] == prev_band:
+            urgencies[i] *= 1.0 + inertia
+    if n == 1:
+        return 0
+    top_idx = 0
+    for i in range(1, n):
+        if urgencies[i] > urgencies[top_idx]:
+            top_idx = i
+    top = urgencies[top_idx]
+    if top == 0:
+        return min(int(u * n), n - 1)
+    second = -np.inf
+    for i in range(n):
+        if i != top_idx and urgencies[i] > second:
+            second = urgencies[i]
+    # Softmax is a delta here: every other proposal has weight below e^-30
+    if (top - second) * inv_temperature > 30.0:
+        return top_idx
+    s = 0.0
+    for i in range(n):
+        urgencies[i] = np.exp((urgencies[i] - top) * inv_temperature)
+        s += urgencies[i]
+    # Same side as Generator.choice(p=...): first index whose cumulative weight exceeds the draw
+    target = u * s
+    c = 0.0
+    for i in range(n):
+        c += urgencies[i]
+        if c > target:
+            return i
+    return n - 1
+
 class Arbiter:
     """
     Global arbiter that blends band action proposals using soft priority with hysteresis.
@@ -15,6 +53,21 @@ class Arbiter:
         self.previous_action: Optional[Action] = None
         self.previous_band: Optional[int] = None
         self.dominant_band_history = []
+        self.band_counts = Counter()
+        
+        # Reusable struct-of-arrays view of the current tick's proposals
+        self._urg_buf = np.empty(32, dtype=np.float64)
+        self._band_buf = np.empty(32, dtype=np.int32)
+        self._ref_buf: List[Optional[ActionProposal]] = [None] * 32
+    
+    @property
+    def temperature(self) -> float:
+        return self._temperature
+    
+    @temperature.setter
+    def temperature(self, value: float):
+        self._temperature = value
+        self._inv_temperature = 1.0 / value
     
     def select_action(self, bands: List[Band], all_proposals: List[List[ActionProposal]], 
                       agent_state: dict) -> tuple[Action, int, ActionProposal]:
@@ -26,81 +79,83 @@ class Arbiter:
         if not all_proposals or all(not proposals for proposals in all_proposals):
             return Action.STAY, 0, None
         
-        flat_proposals = [p for proposals in all_proposals for p in proposals if p is not None]
-        
-        if not flat_proposals:
-            return Action.STAY, 0, None
-        
-        safety_veto = self._check_safety_veto(flat_proposals)
-        if safety_veto is not None:
-            self.previous_action = safety_veto[0]
-            self.previous_band = safety_veto[1]
-            self.dominant_band_history.append(safety_veto[1])
-            return safety_veto
-        
-        energy_constraint = self._check_energy_budget(flat_proposals, agent_state)
-        if energy_constraint is not None:
-            self.previous_action = energy_constraint[0]
-            self.previous_band = energy_constraint[1]
-            self.dominant_band_history.append(energy_constraint[1])
-            return energy_constraint
+        n, override = self._scan_proposals(all_proposals, agent_state.get("energy", 0.0))
         
-        urgencies = np.array([p.urgency for p in flat_proposals])
+        if override is not None:
+            self.previous_action = override.action
+            self.previous_band = override.band_id
+            self._record_band(override.band_id)
+            return override.action, override.band_id, override
         
-        for i, p in enumerate(flat_proposals):
-            if self.previous_band is not None and p.band_id == self.previous_band:
-                urgencies[i] *= (1.0 + self.inertia)
-        
-        if urgencies.max() == 0:
-            probs = np.ones(len(urgencies)) / len(urgencies)
-        else:
-            probs = self._softmax(urgencies / self.temperature)
+        if n == 0:
+            return Action.STAY, 0, None
         
-        selected_idx = self.rng.choice(len(flat_proposals), p=probs)
-        selected = flat_proposals[selected_idx]
+        # The uniform is drawn on every path so seeded runs keep the same RNG stream
+        prev_band = -1 if self.previous_band is None else self.previous_band
+        selected_idx = _arbitrate(self._urg_buf[:n], self._band_buf[:n], prev_band,
+                                  self.inertia, self._inv_temperature, self.rng.random())
+        selected = self._ref_buf[selected_idx]
         
         self.previous_action = selected.action
         self.previous_band = selected.band_id
-        self.dominant_band_history.append(selected.band_id)
+        self._record_band(selected.band_id)
         
         return selected.action, selected.band_id, selected
     
-    def _softmax(self, x: np.ndarray) -> np.ndarray:
-        """Numerically stable softmax."""
-        exp_x = np.exp(x - np.max(x))
-        return exp_x / exp_x.sum()
-    
-    def _check_safety_veto(self, proposals: List[ActionProposal]) -> Optional[tuple]:
-        """Safety band (Band 2) can veto when threat is immediate."""
-        for p in proposals:
-            if p.band_id == 2 and p.urgency > 8.0:
-                return (p.action, p.band_id, p)
-        return None
-    
-    def _check_energy_budget(self, proposals: List[ActionProposal], agent_state: dict) -> Optional[tuple]:
-        """Force physiological action if energy critically low."""
-        energy = agent_state.get("energy", 0.0)
+    def _scan_proposals(self, all_proposals: List[List[ActionProposal]],
+                        energy: float) -> tuple[int, Optional[ActionProposal]]:
+        """
+        Single pass over proposals: fill the reusable buffers and find any override.
         
-        if energy < 10.0:
-            for p in proposals:
-                if p.band_id == 1 and p.params.get("reason") == "critical_hunger":
-                    return (p.action, p.band_id, p)
+        Safety band (Band 2) vetoes when threat is immediate; otherwise a critical-hunger
+        physiological proposal is forced if energy is critically low.
+        Returns: (proposal_count, override_proposal)
+        """
+        total = sum(len(proposals) for proposals in all_proposals)
+        if total > self._urg_buf.size:
+            size = max(total, 2 * self._urg_buf.size)
+            self._urg_buf = np.empty(size, dtype=np.float64)
+            self._band_buf = np.empty(size, dtype=np.int32)
+            self._ref_buf.extend([None] * (size - len(self._ref_buf)))
         
-        return None
+        urg_buf, band_buf, ref_buf = self._urg_buf, self._band_buf, self._ref_buf
+        energy_critical = energy < 10.0
+        forced = None
+        k = 0
+        for proposals in all_proposals:
+            for p in proposals:
+                if p is None:
+                    continue
+                band_id = p.band_id
+                urgency = p.urgency
+                if band_id == 2 and urgency > 8.0:
+                    return k, p
+                if (energy_critical and forced is None and band_id == 1
+                        and p.params.get("reason") == "critical_hunger"):
+                    forced = p
+                urg_buf[k] = urgency
+                band_buf[k] = band_id
+                ref_buf[k] = p
+                k += 1
+        return k, forced
+    
+    def _record_band(self, band_id: int):
+        """Append the dominant band and keep the running per-band counts in step."""
+        self.dominant_band_history.append(band_id)
+        self.band_counts[band_id] += 1
     
     def get_dominant_band_distribution(self) -> dict:
         """Get distribution of which bands have been dominant."""
-        if not self.dominant_band_history:
-            return {}
-        
-        unique, counts = np.unique(self.dominant_band_history, return_counts=True)
         total = len(self.dominant_band_history)
+        if not total:
+            return {}
         
-        return {int(band_id): count / total for band_id, count in zip(unique, counts)}
+        return {int(band_id): self.band_counts[band_id] / total for band_id in sorted(self.band_counts)}
     
     def reset_history(self):
         """Reset arbitration history."""
         self.previous_action = None
         self.previous_band = None
         self.dominant_band_history = []
+        self.band_counts.clear()
 
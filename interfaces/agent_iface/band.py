@@ -23,7 +23,7 @@ class Action(Enum):
     PRACTICE_CRAFT = 15
     PERFORM_RITUAL = 16
 
-@dataclass
+@dataclass(slots=True)
 class ActionProposal:
     action: Action
     urgency: float
@@ -31,7 +31,7 @@ class ActionProposal:
     band_id: int
     params: Dict[str, Any]
 
-@dataclass
+@dataclass(slots=True)
 class BandState:
     urgency: float
     internal_state: Dict[str, Any]
@@ -49,6 +49,12 @@ class Band(ABC):
         )
         self.rng = np.random.default_rng(seed)
         self.memory = []
+        self._max_memories = 1000
+        
+        # Column-wise mirror of self.memory for vectorized relevance scoring
+        self._mem_key = np.empty(64)
+        self._mem_affect = np.empty(64)
+        self._mem_len = 0
         
     @abstractmethod
     def perceive(self, env_state: Dict[str, Any], agent_state: Dict[str, Any]) -> Dict[str, Any]:
@@ -87,7 +93,23 @@ class Band(ABC):
             "dominant_band": outcome.get("dominant_band", self.band_id)
         }
         self.memory.append(memory_entry)
-        self._decay_memory()
+        self._push_memory_columns(memory_entry)
+        if len(self.memory) > self._max_memories:
+            self._decay_memory(self._max_memories)
+    
+    def _push_memory_columns(self, memory_entry: Dict[str, Any]):
+        """Append the entry's relevance key and affect to the memory columns."""
+        n = self._mem_len
+        if n == self._mem_key.size:
+            self._mem_key = np.resize(self._mem_key, 2 * n)
+            self._mem_affect = np.resize(self._mem_affect, 2 * n)
+        self._mem_key[n] = self._memory_key(memory_entry)
+        self._mem_affect[n] = memory_entry.get("affect", 0.0)
+        self._mem_len = n + 1
+    
+    def _memory_key(self, memory_entry: Dict[str, Any]) -> float:
+        """Scalar summary of a memory used by _compute_relevance_batch."""
+        return 0.0
     
     def _compress_perception(self, perception: Dict[str, Any]) -> Dict[str, Any]:
         """Compress perception for memory storage."""
@@ -101,17 +123,23 @@ class Band(ABC):
         """Decay old memories with band-specific bias."""
         if len(self.memory) > max_memories:
             decay_prob = self._get_decay_probabilities()
-            indices_to_keep = self.rng.choice(
-                len(self.memory),
-                size=max_memories,
-                replace=False,
-                p=decay_prob / decay_prob.sum()
-            )
-            self.memory = [self.memory[i] for i in sorted(indices_to_keep)]
+            # Efraimidis-Spirakis weighted sampling without replacement: keep the top-k keys u^(1/w),
+            # ranked in log space as log(u)/w; uniform weights (None) rank on u directly
+            keys = self.rng.random(len(self.memory))
+            if decay_prob is not None:
+                np.log(keys, out=keys)
+                keys /= np.maximum(decay_prob, 1e-12)
+            keep = np.sort(np.argpartition(keys, -max_memories)[-max_memories:])
+            if self._mem_len == len(self.memory):
+                n = len(keep)
+                self._mem_key[:n] = self._mem_key[keep]
+                self._mem_affect[:n] = self._mem_affect[keep]
+                self._mem_len = n
+            self.memory = [self.memory[i] for i in keep]
     
     @abstractmethod
-    def _get_decay_probabilities(self) -> np.ndarray:
-        """Get band-specific memory decay probabilities."""
+    def _get_decay_probabilities(self) -> Optional[np.ndarray]:
+        """Get band-specific memory decay probabilities; None means uniform."""
         pass
     
     def query_memory(self, query_context: Dict[str, Any], k: int = 10) -> List[Dict[str, Any]]:
@@ -119,16 +147,26 @@ class Band(ABC):
         if not self.memory:
             return []
         
-        relevance_scores = np.array([
-            self._compute_relevance(mem, query_context)
-            for mem in self.memory
-        ])
+        relevance_scores = None
+        if self._mem_len == len(self.memory):
+            relevance_scores = self._compute_relevance_batch(
+                self._mem_key[:self._mem_len], self._mem_affect[:self._mem_len], query_context
+            )
+        if relevance_scores is None:
+            relevance_scores = np.array([
+                self._compute_relevance(mem, query_context)
+                for mem in self.memory
+            ])
         
         if relevance_scores.sum() == 0:
             top_k_indices = self.rng.choice(len(self.memory), size=min(k, len(self.memory)), replace=False)
         else:
-            probs = relevance_scores / relevance_scores.sum()
-            top_k_indices = np.argsort(relevance_scores)[-k:]
+            if k < len(relevance_scores):
+                # O(n) selection of the top k, then order only those k ascending as argsort did
+                top_k_indices = np.argpartition(relevance_scores, -k)[-k:]
+                top_k_indices = top_k_indices[np.argsort(relevance_scores[top_k_indices])]
+            else:
+                top_k_indices = np.argsort(relevance_scores)
         
         return [self.memory[i] for i in top_k_indices]
     
@@ -137,6 +175,11 @@ class Band(ABC):
         """Compute relevance of a memory to current context."""
         pass
     
+    def _compute_relevance_batch(self, keys: np.ndarray, affects: np.ndarray,
+                                 context: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Vectorized relevance over the memory columns; None falls back to _compute_relevance."""
+        return None
+    
     def update_gain(self, frustration_threshold: float = 10.0, gain_increment: float = 0.1):
         """Adapt gain if band is chronically frustrated."""
         if self.state.frustration_accumulator > frustration_threshold:
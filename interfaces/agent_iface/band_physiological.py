@@ -1,7 +1,223 @@
 import numpy as np
-from typing import Dict, Any, List, Optional
+from collections.abc import MutableMapping
+from dataclasses import dataclass
+from numba import njit, prange
+from typing import Dict, Any, List, Optional, Tuple
 from .band import Band, Action, ActionProposal
 
+# Action codes used inside the Numba kernels; numba freezes these globals as compile-time constants
+_FORAGE = Action.FORAGE.value
+_DRINK = Action.DRINK.value
+
+# Action-set bitmask keyed by Action.value for O(1) membership tests in _action_cost_step
+_FEED_MASK = (1 << _FORAGE) | (1 << _DRINK)
+
+# Focus codes index the 4-vector of drives; internal_state keeps the name for readers
+FOCUS_HUNGER, FOCUS_THIRST, FOCUS_FATIGUE, FOCUS_THREAT = 0, 1, 2, 3
+FOCUS_NAMES = ("hunger", "thirst", "fatigue", "threat")
+_FOCUS_CODES = {name: code for code, name in enumerate(FOCUS_NAMES)}
+
+# Directions present in a (possibly edge-clipped) window, keyed by a 4-bit mask:
+# bit 0 north, bit 1 south, bit 2 east, bit 3 west (the N, S, E, W order of the gradient step)
+_DIR_ORDER = (Action.MOVE_NORTH, Action.MOVE_SOUTH, Action.MOVE_EAST, Action.MOVE_WEST)
+_DIRS_BY_MASK = tuple(tuple(a for bit, a in enumerate(_DIR_ORDER) if mask >> bit & 1) for mask in range(16))
+
+# Shared read-only default for perceptions without a threat field
+_ZERO_THREAT = np.zeros((5, 5))
+_ZERO_THREAT.setflags(write=False)
+
+@njit(cache=True)
+def _gradient_step(neighborhood, threshold, follow_any):
+    """
+    4-neighbour gradient step from the centre cell of one neighborhood.
+    Returns (code, follow): code is the best Action code among N, S, E, W present in the
+    window (first maximum in that order, -1 when none are), follow whether to take it.
+    """
+    h, w = neighborhood.shape
+    cy = h // 2
+    cx = w // 2
+    best = -1
+    best_val = 0.0
+    if cy > 0:
+        best = 0
+        best_val = neighborhood[cy - 1, cx]
+    if cy < h - 1 and (best < 0 or neighborhood[cy + 1, cx] > best_val):
+        best = 1
+        best_val = neighborhood[cy + 1, cx]
+    if cx < w - 1 and (best < 0 or neighborhood[cy, cx + 1] > best_val):
+        best = 2
+        best_val = neighborhood[cy, cx + 1]
+    if cx > 0 and (best < 0 or neighborhood[cy, cx - 1] > best_val):
+        best = 3
+        best_val = neighborhood[cy, cx - 1]
+    if best < 0:
+        return best, False
+    return best, follow_any or best_val > neighborhood[cy, cx] + threshold
+
+@njit(parallel=True, cache=True)
+def _tick_drives(slots, hunger, thirst, fatigue, focus, focus_strength, ticks_since_satisfaction,
+                 desperation, search_radius, risk_tolerance, local_threat, gain, urgency_out,
+                 rates, weights, bonus, switch_threshold, buildup_rate):
+    """
+    One fused pass of PhysiologicalBand.compute_urgency per slot: passive depletion, focus
+    with adaptive hysteresis, desperation, then gain-scaled urgency into urgency_out[k].
+    Focus codes index (hunger, thirst, fatigue, threat); -1 is no focus.
+    """
+    for k in prange(slots.shape[0]):
+        i = slots[k]
+        h = min(hunger[i] + rates[0], 1.0)
+        t = min(thirst[i] + rates[1], 1.0)
+        f = min(fatigue[i] + rates[2], 1.0)
+        hunger[i] = h
+        thirst[i] = t
+        fatigue[i] = f
+        
+        d0 = h * weights[0]
+        d1 = t * weights[1]
+        d2 = f * weights[2]
+        d3 = local_threat[k] * weights[3]
+        max_drive = max(max(d0, d1), max(d2, d3))
+        multiplier = 1.0
+        if max_drive > 2.0:
+            multiplier = 0.3
+        elif max_drive > 1.5:
+            multiplier = 0.6
+        
+        current = focus[i]
+        strength = focus_strength[i]
+        if current >= 0:
+            b = strength * bonus * multiplier
+            if current == 0:
+                d0 += b
+            elif current == 1:
+                d1 += b
+            elif current == 2:
+                d2 += b
+            else:
+                d3 += b
+        
+        # First maximum wins, as max() over the scalar path's drive dict does
+        dominant = 0
+        top = d0
+        if d1 > top:
+            dominant = 1
+            top = d1
+        if d2 > top:
+            dominant = 2
+            top = d2
+        if d3 > top:
+            dominant = 3
+            top = d3
+        
+        if dominant == current:
+            buildup = buildup_rate * (1.0 if max_drive < 1.5 else 0.5)
+            strength = min(1.0, strength + buildup)
+        else:
+            current_urgency = 0.0
+            if current == 0:
+                current_urgency = d0
+            elif current == 1:
+                current_urgency = d1
+            elif current == 2:
+                current_urgency = d2
+            elif current == 3:
+                current_urgency = d3
+            critical = (dominant == 0 and h > 0.9) or (dominant == 1 and t > 0.9) or (dominant == 2 and f > 0.9)
+            if critical:
+                current = dominant
+                strength = 0.2
+            elif top > current_urgency + switch_threshold * multiplier:
+                current = dominant
+                strength = 0.3
+        focus[i] = current
+        focus_strength[i] = strength
+        
+        deficit = (h ** 2 + t ** 2) / 2.0
+        time_desperation = min(ticks_since_satisfaction[i] / 50.0, 1.0)
+        desp = deficit if deficit >= time_desperation else time_desperation
+        desperation[i] = desp
+        search_radius[i] = int(2 + desp * 8)
+        risk_tolerance[i] = 0.1 + desp * 0.5
+        
+        urgency_out[k] = top * (1.0 + desp) * gain[k]
+
+@njit(cache=True)
+def _action_cost_step(a, veg, hyd, energy, hunger, thirst, fatigue, ticks_since_satisfaction,
+                      feed_mask, cost_table):
+    """
+    Drive update of PhysiologicalBand.update_state for one Action code, shared by the scalar
+    band path and the population kernel. cost_table is PhysiologicalBand.COST_TABLE:
+    (energy, hunger, thirst, fatigue) deltas per code. Returns the new
+    (energy, hunger, thirst, fatigue, ticks_since_satisfaction, fed).
+    """
+    fed = False
+    energy = max(0.0, energy + cost_table[a, 0])
+    hunger = min(1.0, max(0.0, hunger + cost_table[a, 1]))
+    thirst = min(1.0, max(0.0, thirst + cost_table[a, 2]))
+    fatigue = min(1.0, max(0.0, fatigue + cost_table[a, 3]))
+    if a == _FORAGE and veg > 0.2:
+        hunger = max(0.0, hunger - veg * 0.2)
+        energy = min(100.0, energy + veg * 10.0)
+        ticks_since_satisfaction = 0
+        fed = True
+    elif a == _DRINK and hyd > 0.7:
+        thirst = max(0.0, thirst - (hyd - 0.7) * 0.5)
+        ticks_since_satisfaction = 0
+    if not ((1 << a) & feed_mask) or (a == _FORAGE and veg < 0.2) or (a == _DRINK and hyd < 0.7):
+        ticks_since_satisfaction += 1
+    return energy, hunger, thirst, fatigue, ticks_since_satisfaction, fed
+
+@njit(parallel=True, cache=True)
+def _apply_action_costs(slots, actions, local_vegetation, local_hydration, energy, hunger, thirst,
+                        fatigue, ticks_since_satisfaction, fed_out, feed_mask, cost_table):
+    """_action_cost_step for every slot at once; fed_out[k] is whether slot k foraged successfully."""
+    for k in prange(slots.shape[0]):
+        i = slots[k]
+        energy[i], hunger[i], thirst[i], fatigue[i], ticks_since_satisfaction[i], fed_out[k] = _action_cost_step(
+            actions[k], local_vegetation[k], local_hydration[k], energy[i], hunger[i], thirst[i],
+            fatigue[i], ticks_since_satisfaction[i], feed_mask, cost_table)
+
+def gather_windows(padded_field: np.ndarray, xs: np.ndarray, ys: np.ndarray, radius: int,
+                   out: np.ndarray) -> np.ndarray:
+    """
+    Fill out[:N] with the (2r+1, 2r+1) window around each (x, y) of a world field that has
+    been padded by `radius` (edge mode for clamped borders, wrap mode for a torus).
+    One np.take over flat offsets into the preallocated buffer; returns out[:N].
+    """
+    k = 2 * radius + 1
+    wp = padded_field.shape[1]
+    n = xs.shape[0]
+    # Top-left of each window in padded coordinates is (y, x); offsets walk the k x k block
+    offsets = np.arange(k)[:, None] * wp + np.arange(k)[None, :]
+    index = (ys * wp + xs)[:, None, None] + offsets
+    return np.take(padded_field.ravel(), index, out=out[:n])
+
+@dataclass(slots=True)
+class PhysiologicalPerception:
+    """Band 1 perception with attribute access; mapping-style reads are kept for existing callers."""
+    local_temperature: float
+    local_hydration: float
+    local_vegetation: float
+    local_threat: float
+    neighborhood_threat: np.ndarray
+    neighborhood_vegetation: Optional[np.ndarray]
+    neighborhood_hydration: Optional[np.ndarray]
+    energy: float
+    position: Tuple[int, int]
+    tick: int
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+    
+    def items(self):
+        return ((name, getattr(self, name)) for name in self.__slots__)
+
 class PhysiologicalBand(Band):
     """
     Band 1: Physiological - True Homeostatic Drive System
@@ -31,13 +247,36 @@ class PhysiologicalBand(Band):
     
     REST_FATIGUE_RECOVERY = 0.1
     
+    # Drive deltas (energy, hunger, thirst, fatigue) per Action.value; rows of zeros cost nothing
+    COST_TABLE = np.zeros((len(Action), 4))
+    COST_TABLE[[a.value for a in _DIR_ORDER]] = (-MOVE_ENERGY_COST, MOVE_HUNGER_COST,
+                                                 MOVE_THIRST_COST, MOVE_FATIGUE_COST)
+    COST_TABLE[Action.FORAGE.value] = (-FORAGE_ENERGY_COST, 0.0, 0.0, FORAGE_FATIGUE_COST)
+    COST_TABLE[Action.REST.value] = (0.0, PASSIVE_HUNGER_RATE * 0.5, 0.0, -REST_FATIGUE_RECOVERY)
+    COST_TABLE.setflags(write=False)
+    
     FOCUS_SWITCH_THRESHOLD = 0.2    # How much more urgent to switch focus
     FOCUS_BUILDUP_RATE = 0.1        # Commitment strengthens over time
     FOCUS_HYSTERESIS_BONUS = 0.3    # Bonus to current focus for stability
     
-    def __init__(self, band_id: int = 1, initial_gain: float = 2.0, seed: int = None):
+    # Drive weights for focus selection
+    HUNGER_WEIGHT = 2.0
+    THIRST_WEIGHT = 1.3             # Reduced from 1.5 to balance with hunger
+    FATIGUE_WEIGHT = 0.8
+    THREAT_WEIGHT = 10.0            # Threats get highest priority
+    
+    # Constant vectors handed to the population kernels, indexed by FOCUS_* code
+    PASSIVE_RATES = np.array([PASSIVE_HUNGER_RATE, PASSIVE_THIRST_RATE, PASSIVE_FATIGUE_RATE])
+    PASSIVE_RATES.setflags(write=False)
+    DRIVE_WEIGHTS = np.array([HUNGER_WEIGHT, THIRST_WEIGHT, FATIGUE_WEIGHT, THREAT_WEIGHT])
+    DRIVE_WEIGHTS.setflags(write=False)
+    
+    _DIR_ACTIONS = _DIR_ORDER
+    
+    def __init__(self, band_id: int = 1, initial_gain: float = 2.0, seed: int = None,
+                 population: Optional["PhysiologicalPopulation"] = None, slot: Optional[int] = None):
         super().__init__(band_id, initial_gain, seed)
-        self.state.internal_state = {
+        internal_state = {
             # Primary drives (0.0 = satisfied, 1.0 = critical)
             "hunger": 0.0,
             "thirst": 0.0,
@@ -63,24 +302,40 @@ class PhysiologicalBand(Band):
             "successful_forages": 0,
             "failed_searches": 0
         }
+        # Attached bands keep their hot drives in the shared population columns
+        self.population = population
+        if population is not None:
+            internal_state = population.attach(internal_state, slot)
+        self.state.internal_state = internal_state
+        # One proposal per tick, refilled in place; valid until the next propose_actions call
+        self._proposal = ActionProposal(Action.STAY, 0.0, 0.0, band_id, {})
+        self._proposals = [self._proposal]
     
-    def perceive(self, env_state: Dict[str, Any], agent_state: Dict[str, Any]) -> Dict[str, Any]:
+    def perceive(self, env_state: Dict[str, Any], agent_state: Dict[str, Any]) -> PhysiologicalPerception:
         """High-fidelity perception of local environment and neighborhood gradients."""
-        return {
-            "local_temperature": env_state.get("temperature", 0.5),
-            "local_hydration": env_state.get("hydration", 0.5),
-            "local_vegetation": env_state.get("vegetation", 0.0),
-            "local_threat": env_state.get("threat", 0.0),
-            "neighborhood_threat": env_state.get("neighborhood_threat", np.zeros((5, 5))),
-            "neighborhood_vegetation": env_state.get("neighborhood_vegetation", None),
-            "neighborhood_hydration": env_state.get("neighborhood_hydration", None),
-            "energy": agent_state.get("energy", 0.0),
-            "position": agent_state.get("position", (0, 0)),
-            "tick": agent_state.get("tick", 0)
-        }
+        return PhysiologicalPerception(
+            local_temperature=env_state.get("temperature", 0.5),
+            local_hydration=env_state.get("hydration", 0.5),
+            local_vegetation=env_state.get("vegetation", 0.0),
+            local_threat=env_state.get("threat", 0.0),
+            neighborhood_threat=env_state.get("neighborhood_threat", _ZERO_THREAT),
+            neighborhood_vegetation=env_state.get("neighborhood_vegetation", None),
+            neighborhood_hydration=env_state.get("neighborhood_hydration", None),
+            energy=agent_state.get("energy", 0.0),
+            position=agent_state.get("position", (0, 0)),
+            tick=agent_state.get("tick", 0)
+        )
     
-    def compute_urgency(self, perception: Dict[str, Any]) -> float:
+    def compute_urgency(self, perception: PhysiologicalPerception) -> float:
         """Urgency emerges from focused drive and desperation level."""
+        population = self.population
+        if population is not None and population.urgency_ready[self.state.internal_state.slot]:
+            # Already advanced this tick by PhysiologicalPopulation.compute_urgency
+            slot = self.state.internal_state.slot
+            population.urgency_ready[slot] = False
+            self.state.urgency = population.urgency.item(slot)
+            return self.state.urgency
+        
         # Update drives (passive depletion)
         self._apply_passive_depletion()
         
@@ -96,11 +351,12 @@ class PhysiologicalBand(Band):
         
         return self.state.urgency
     
-    def propose_actions(self, perception: Dict[str, Any]) -> List[ActionProposal]:
+    def propose_actions(self, perception: PhysiologicalPerception) -> List[ActionProposal]:
         """Actions emerge from focused drive and desperation level."""
-        focus = self.state.internal_state.get("current_focus", None)
+        isd = self.state.internal_state
+        focus = isd.get("current_focus", None)
         urgency = self.state.urgency
-        desperation = self.state.internal_state.get("desperation_level", 0.0)
+        desperation = isd.get("desperation_level", 0.0)
         
         # Propose action based on focused drive
         if focus == "threat":
@@ -113,84 +369,52 @@ class PhysiologicalBand(Band):
             return self._propose_rest_action(perception, urgency)
         else:
             # No urgent needs - just stay
-            return [ActionProposal(
-                action=Action.STAY,
-                urgency=0.1,
-                expected_value=0.0,
-                band_id=self.band_id,
-                params={"reason": "content"}
-            )]
-    
-    def update_state(self, perception: Dict[str, Any], action_taken: Action, outcome: Dict[str, Any]):
+            return self._propose(Action.STAY, 0.1, 0.0, {"reason": "content"})
+    
+    def update_state(self, perception: PhysiologicalPerception, action_taken: Action, outcome: Dict[str, Any]):
         """Update internal state based on action costs and rewards."""
-        self.state.internal_state["last_action"] = action_taken
-        
-        # Apply action costs
-        if action_taken in [Action.MOVE_NORTH, Action.MOVE_SOUTH, Action.MOVE_EAST, Action.MOVE_WEST]:
-            self.state.internal_state["energy"] = max(0.0, 
-                self.state.internal_state["energy"] - self.MOVE_ENERGY_COST)
-            self.state.internal_state["hunger"] = min(1.0,
-                self.state.internal_state["hunger"] + self.MOVE_HUNGER_COST)
-            self.state.internal_state["thirst"] = min(1.0,
-                self.state.internal_state["thirst"] + self.MOVE_THIRST_COST)
-            self.state.internal_state["fatigue"] = min(1.0,
-                self.state.internal_state["fatigue"] + self.MOVE_FATIGUE_COST)
-            
-        elif action_taken == Action.FORAGE:
-            self.state.internal_state["energy"] = max(0.0,
-                self.state.internal_state["energy"] - self.FORAGE_ENERGY_COST)
-            self.state.internal_state["fatigue"] = min(1.0,
-                self.state.internal_state["fatigue"] + self.FORAGE_FATIGUE_COST)
-            
-            # Apply rewards if successful
-            local_veg = perception.get("local_vegetation", 0.0)
-            if local_veg > 0.2:
-                hunger_reduction = local_veg * 0.2
-                energy_gain = local_veg * 10.0
-                
-                self.state.internal_state["hunger"] = max(0.0,
-                    self.state.internal_state["hunger"] - hunger_reduction)
-                self.state.internal_state["energy"] = min(100.0,
-                    self.state.internal_state["energy"] + energy_gain)
-                
-                self.state.internal_state["successful_forages"] += 1
-                self.state.internal_state["ticks_since_satisfaction"] = 0
+        isd = self.state.internal_state
+        isd["last_action"] = action_taken
+        
+        population = self.population
+        if population is not None and population.costs_ready[isd.slot]:
+            # Already applied this tick by PhysiologicalPopulation.apply_action_costs
+            slot = isd.slot
+            population.costs_ready[slot] = False
+            fed = population.fed.item(slot)
+        else:
+            # Table costs, energy floored at 0 and drives clipped to [0, 1], then forage/drink rewards
+            energy, hunger, thirst, fatigue, ticks, fed = _action_cost_step(
+                action_taken.value, float(perception.local_vegetation), float(perception.local_hydration),
+                float(isd["energy"]), float(isd["hunger"]), float(isd["thirst"]), float(isd["fatigue"]),
+                int(isd["ticks_since_satisfaction"]), _FEED_MASK, self.COST_TABLE)
+            isd["energy"] = energy
+            isd["hunger"] = hunger
+            isd["thirst"] = thirst
+            isd["fatigue"] = fatigue
+            isd["ticks_since_satisfaction"] = ticks
+        
+        if action_taken == Action.FORAGE:
+            if fed:
+                isd["successful_forages"] += 1
             else:
-                self.state.internal_state["failed_searches"] += 1
-                
-        elif action_taken == Action.DRINK:
-            # Apply thirst reduction if water available
-            local_hydration = perception.get("local_hydration", 0.5)
-            if local_hydration > 0.7:
-                thirst_reduction = (local_hydration - 0.7) * 0.5  # Proportional to water quality
-                self.state.internal_state["thirst"] = max(0.0,
-                    self.state.internal_state["thirst"] - thirst_reduction)
-                self.state.internal_state["ticks_since_satisfaction"] = 0
-            
-        elif action_taken == Action.REST:
-            self.state.internal_state["fatigue"] = max(0.0,
-                self.state.internal_state["fatigue"] - self.REST_FATIGUE_RECOVERY)
-            self.state.internal_state["hunger"] = min(1.0,
-                self.state.internal_state["hunger"] + self.PASSIVE_HUNGER_RATE * 0.5)
-        
-        # Increment ticks since last satisfaction
-        if action_taken not in [Action.FORAGE, Action.DRINK] or \
-           (action_taken == Action.FORAGE and perception.get("local_vegetation", 0.0) < 0.2) or \
-           (action_taken == Action.DRINK and perception.get("local_hydration", 0.5) < 0.7):
-            self.state.internal_state["ticks_since_satisfaction"] += 1
+                isd["failed_searches"] += 1
         
         # Frustration accumulation
-        if self.state.internal_state.get("desperation_level", 0.0) > 0.6:
-            self.state.frustration_accumulator = min(1.0, self.state.frustration_accumulator + 0.05)
+        state = self.state
+        if isd.get("desperation_level", 0.0) > 0.6:
+            frustration = state.frustration_accumulator + 0.05
+            state.frustration_accumulator = frustration if frustration < 1.0 else 1.0
         else:
-            self.state.frustration_accumulator = max(0.0, self.state.frustration_accumulator - 0.02)
+            frustration = state.frustration_accumulator - 0.02
+            state.frustration_accumulator = frustration if frustration > 0.0 else 0.0
     
-    def compute_learning_signal(self, perception: Dict[str, Any], action: Action, outcome: Dict[str, Any]) -> float:
+    def compute_learning_signal(self, perception: PhysiologicalPerception, action: Action, outcome: Dict[str, Any]) -> float:
         """Learning signal from homeostatic error reduction."""
         # Positive signal if action reduced focused drive
         focus = self.state.internal_state.get("current_focus", None)
         if focus == "hunger" and action == Action.FORAGE:
-            local_veg = perception.get("local_vegetation", 0.0)
+            local_veg = perception.local_vegetation
             return local_veg * 0.5  # Reward proportional to food quality
         return 0.0
     
@@ -198,33 +422,33 @@ class PhysiologicalBand(Band):
     
     def _apply_passive_depletion(self):
         """Drives continuously deplete over time (base metabolism)."""
-        self.state.internal_state["hunger"] = min(1.0,
-            self.state.internal_state["hunger"] + self.PASSIVE_HUNGER_RATE)
-        self.state.internal_state["thirst"] = min(1.0,
-            self.state.internal_state["thirst"] + self.PASSIVE_THIRST_RATE)
-        self.state.internal_state["fatigue"] = min(1.0,
-            self.state.internal_state["fatigue"] + self.PASSIVE_FATIGUE_RATE)
-    
-    def _compute_focus(self, perception: Dict[str, Any]) -> tuple[Optional[str], float]:
+        isd = self.state.internal_state
+        hunger = isd["hunger"] + self.PASSIVE_HUNGER_RATE
+        thirst = isd["thirst"] + self.PASSIVE_THIRST_RATE
+        fatigue = isd["fatigue"] + self.PASSIVE_FATIGUE_RATE
+        isd["hunger"] = hunger if hunger < 1.0 else 1.0
+        isd["thirst"] = thirst if thirst < 1.0 else 1.0
+        isd["fatigue"] = fatigue if fatigue < 1.0 else 1.0
+    
+    def _compute_focus(self, perception: PhysiologicalPerception) -> tuple[Optional[str], float]:
         """Determine which drive should dominate attention (with adaptive hysteresis)."""
-        # Compute all drive urgencies
-        hunger = self.state.internal_state["hunger"]
-        thirst = self.state.internal_state["thirst"]
-        fatigue = self.state.internal_state["fatigue"]
-        threat = perception.get("local_threat", 0.0)
-        
-        drives = {
-            "hunger": hunger * 2.0,      # Base weights
-            "thirst": thirst * 1.3,      # Reduced from 1.5 to balance with hunger
-            "fatigue": fatigue * 0.8,
-            "threat": threat * 10.0      # Threats get highest priority
-        }
-        
-        current_focus = self.state.internal_state.get("current_focus", None)
-        focus_strength = self.state.internal_state.get("focus_strength", 0.0)
+        # Compute all drive urgencies, indexed by FOCUS_* code
+        isd = self.state.internal_state
+        hunger = isd["hunger"]
+        thirst = isd["thirst"]
+        fatigue = isd["fatigue"]
+        drives = [
+            hunger * self.HUNGER_WEIGHT,
+            thirst * self.THIRST_WEIGHT,
+            fatigue * self.FATIGUE_WEIGHT,
+            perception.local_threat * self.THREAT_WEIGHT
+        ]
+        
+        current = _FOCUS_CODES.get(isd.get("current_focus", None), -1)
+        focus_strength = isd.get("focus_strength", 0.0)
         
         # ADAPTIVE HYSTERESIS: weaker when drives are extreme
-        max_drive = max(drives.values())
+        max_drive = max(drives)
         hysteresis_multiplier = 1.0
         if max_drive > 2.0:  # Critical level (e.g., hunger=1.0 * 2.0 weight)
             hysteresis_multiplier = 0.3  # Much easier to switch when desperate
@@ -232,143 +456,124 @@ class PhysiologicalBand(Band):
             hysteresis_multiplier = 0.6  # Moderate resistance
         
         # Apply hysteresis bonus (reduced when desperate)
-        if current_focus and current_focus in drives:
-            hysteresis_bonus = focus_strength * self.FOCUS_HYSTERESIS_BONUS * hysteresis_multiplier
-            drives[current_focus] += hysteresis_bonus
+        if current >= 0:
+            drives[current] += focus_strength * self.FOCUS_HYSTERESIS_BONUS * hysteresis_multiplier
         
-        # Find most urgent drive
-        dominant_drive = max(drives, key=drives.get)
-        dominant_urgency = drives[dominant_drive]
+        # Find most urgent drive (first maximum in FOCUS_* order)
+        dominant = FOCUS_HUNGER
+        dominant_urgency = drives[FOCUS_HUNGER]
+        for code in (FOCUS_THIRST, FOCUS_FATIGUE, FOCUS_THREAT):
+            if drives[code] > dominant_urgency:
+                dominant = code
+                dominant_urgency = drives[code]
         
         # Decide whether to switch focus
-        if dominant_drive == current_focus:
+        if dominant == current:
             # Strengthen commitment to current focus (slower buildup when desperate)
             buildup_rate = self.FOCUS_BUILDUP_RATE * (1.0 if max_drive < 1.5 else 0.5)
-            focus_strength = min(1.0, focus_strength + buildup_rate)
+            focus_strength += buildup_rate
+            if focus_strength > 1.0:
+                focus_strength = 1.0
         else:
             # Switch threshold adapts: lower when drives are extreme
             switch_threshold = self.FOCUS_SWITCH_THRESHOLD * hysteresis_multiplier
             
-            current_urgency = drives.get(current_focus, 0.0) if current_focus else 0.0
-            
-            # CRITICAL OVERRIDE: If any drive is critical (>0.9), force switch if it's higher
-            critical_drives = {k: v for k, v in 
-                             [("hunger", hunger), ("thirst", thirst), ("fatigue", fatigue)]
-                             if v > 0.9}
+            current_urgency = drives[current] if current >= 0 else 0.0
             
-            if critical_drives and dominant_drive in critical_drives:
-                # Force switch to critical need regardless of hysteresis
-                current_focus = dominant_drive
+            # CRITICAL OVERRIDE: a critical (>0.9) homeostatic drive that dominates forces the switch
+            if dominant != FOCUS_THREAT and (hunger, thirst, fatigue)[dominant] > 0.9:
+                current = dominant
                 focus_strength = 0.2  # Low initial commitment (ready to switch again)
             elif dominant_urgency > current_urgency + switch_threshold:
                 # Normal switch
-                current_focus = dominant_drive
+                current = dominant
                 focus_strength = 0.3
             # else: maintain current focus
         
-        self.state.internal_state["current_focus"] = current_focus
-        self.state.internal_state["focus_strength"] = focus_strength
+        current_focus = FOCUS_NAMES[current] if current >= 0 else None
+        isd["current_focus"] = current_focus
+        isd["focus_strength"] = focus_strength
         
         return current_focus, dominant_urgency
     
     def _compute_desperation(self) -> float:
         """Desperation increases with unmet needs and failed searches."""
-        hunger = self.state.internal_state["hunger"]
-        thirst = self.state.internal_state["thirst"]
-        ticks_since_satisfaction = self.state.internal_state.get("ticks_since_satisfaction", 0)
+        isd = self.state.internal_state
+        hunger = isd["hunger"]
+        thirst = isd["thirst"]
+        ticks_since_satisfaction = isd.get("ticks_since_satisfaction", 0)
         
         # Desperation from deficits (quadratic - gets severe quickly)
         deficit_desperation = (hunger ** 2 + thirst ** 2) / 2.0
         
         # Desperation from prolonged failure to satisfy needs
-        time_desperation = min(1.0, ticks_since_satisfaction / 50.0)
+        time_desperation = ticks_since_satisfaction / 50.0
+        if time_desperation > 1.0:
+            time_desperation = 1.0
         
-        desperation = max(deficit_desperation, time_desperation)
-        self.state.internal_state["desperation_level"] = desperation
+        desperation = deficit_desperation if deficit_desperation >= time_desperation else time_desperation
+        isd["desperation_level"] = desperation
         
         # Desperation changes search behavior (wider radius for desperate agents)
         base_search_radius = 2
-        self.state.internal_state["search_radius"] = int(base_search_radius + desperation * 8)  # 2 -> 10
-        self.state.internal_state["risk_tolerance"] = 0.1 + desperation * 0.5  # 0.1 -> 0.6
+        isd["search_radius"] = int(base_search_radius + desperation * 8)  # 2 -> 10
+        isd["risk_tolerance"] = 0.1 + desperation * 0.5  # 0.1 -> 0.6
         
         return desperation
     
     # ========== Action Proposal Methods ==========
     
-    def _propose_flee_action(self, perception: Dict[str, Any], urgency: float) -> List[ActionProposal]:
+    def _propose(self, action: Action, urgency: float, expected_value: float,
+                 params: Dict[str, Any]) -> List[ActionProposal]:
+        """Refill the band's reusable proposal and return it as the one-element proposal list."""
+        proposal = self._proposal
+        proposal.action = action
+        proposal.urgency = urgency
+        proposal.expected_value = expected_value
+        proposal.params = params
+        return self._proposals
+    
+    def _propose_flee_action(self, perception: PhysiologicalPerception, urgency: float) -> List[ActionProposal]:
         """Flee from immediate threats."""
-        threat_gradient = perception.get("neighborhood_threat", np.zeros((5, 5)))
+        threat_gradient = perception.neighborhood_threat
         safe_direction = self._find_safest_direction(threat_gradient)
         
-        return [ActionProposal(
-            action=safe_direction,
-            urgency=urgency,
-            expected_value=1.0,
-            band_id=self.band_id,
-            params={"reason": "flee_predator", "threat_level": perception.get("local_threat", 0.0)}
-        )]
+        return self._propose(safe_direction, urgency, 1.0,
+                             {"reason": "flee_predator", "threat_level": perception.local_threat})
     
-    def _propose_hunger_action(self, perception: Dict[str, Any], urgency: float, desperation: float) -> List[ActionProposal]:
+    def _propose_hunger_action(self, perception: PhysiologicalPerception, urgency: float, desperation: float) -> List[ActionProposal]:
         """Hunger-driven behavior: forage locally or search with expanding radius."""
-        local_veg = perception.get("local_vegetation", 0.0)
+        local_veg = perception.local_vegetation
         
         # Threshold for acceptable food decreases with desperation
         acceptable_threshold = 0.3 - desperation * 0.2  # 0.3 -> 0.1
         
         # If acceptable food here, forage
         if local_veg > acceptable_threshold:
-            return [ActionProposal(
-                action=Action.FORAGE,
-                urgency=urgency,
-                expected_value=local_veg * 5.0,
-                band_id=self.band_id,
-                params={"food_quality": local_veg, "desperate": desperation > 0.5}
-            )]
+            return self._propose(Action.FORAGE, urgency, local_veg * 5.0,
+                                 {"food_quality": local_veg, "desperate": desperation > 0.5})
         
         # Otherwise, search for food (radius expands with desperation)
-        best_direction = self._find_vegetation_direction(perception)
-        
-        return [ActionProposal(
-            action=best_direction,
-            urgency=urgency * (1.0 + desperation * 0.5),
-            expected_value=1.0,
-            band_id=self.band_id,
-            params={"searching_food": True, "desperation": desperation,
-                   "search_radius": self.state.internal_state.get("search_radius", 2)}
-        )]
-    
-    def _propose_thirst_action(self, perception: Dict[str, Any], urgency: float, desperation: float) -> List[ActionProposal]:
+        best_direction = self._find_vegetation_direction(perception, desperation)
+        
+        return self._propose(best_direction, urgency * (1.0 + desperation * 0.5), 1.0,
+                             {"searching_food": True, "desperation": desperation,
+                              "search_radius": self.state.internal_state.get("search_radius", 2)})
+    
+    def _propose_thirst_action(self, perception: PhysiologicalPerception, urgency: float, desperation: float) -> List[ActionProposal]:
         """Thirst-driven behavior: drink or search for water."""
-        local_hydration = perception.get("local_hydration", 0.5)
+        local_hydration = perception.local_hydration
         
         if local_hydration > 0.7:
-            return [ActionProposal(
-                action=Action.DRINK,
-                urgency=urgency,
-                expected_value=local_hydration * 4.0,
-                band_id=self.band_id,
-                params={"water_quality": local_hydration}
-            )]
+            return self._propose(Action.DRINK, urgency, local_hydration * 4.0, {"water_quality": local_hydration})
         
         # Search for water
         best_direction = self._find_water_direction(perception)
-        return [ActionProposal(
-            action=best_direction,
-            urgency=urgency,
-            expected_value=1.0,
-            band_id=self.band_id,
-            params={"searching_water": True}
-        )]
-    
-    def _propose_rest_action(self, perception: Dict[str, Any], urgency: float) -> List[ActionProposal]:
+        return self._propose(best_direction, urgency, 1.0, {"searching_water": True})
+    
+    def _propose_rest_action(self, perception: PhysiologicalPerception, urgency: float) -> List[ActionProposal]:
         """Rest to recover from fatigue."""
-        return [ActionProposal(
-            action=Action.REST,
-            urgency=urgency,
-            expected_value=0.5,
-            band_id=self.band_id,
-            params={"fatigue_level": self.state.internal_state["fatigue"]}
-        )]
+        return self._propose(Action.REST, urgency, 0.5, {"fatigue_level": self.state.internal_state["fatigue"]})
     
     # ========== Navigation Methods ==========
     
@@ -376,91 +581,52 @@ class PhysiologicalBand(Band):
         """Find direction with lowest threat."""
         if threat_field.size == 0:
             return Action.STAY
+        if threat_field is _ZERO_THREAT:
+            # All-zero field: argmin would pick the first direction
+            return self._DIR_ACTIONS[0]
         
         center = threat_field.shape[0] // 2
         
-        directions = {
-            Action.MOVE_NORTH: threat_field[center-1, center] if center > 0 else 1.0,
-            Action.MOVE_SOUTH: threat_field[center+1, center] if center < threat_field.shape[0]-1 else 1.0,
-            Action.MOVE_EAST: threat_field[center, center+1] if center < threat_field.shape[1]-1 else 1.0,
-            Action.MOVE_WEST: threat_field[center, center-1] if center > 0 else 1.0
-        }
+        # Ordered as _DIR_ACTIONS; argmin keeps the first minimum, matching the old dict-order tie-break
+        threats = np.array([
+            threat_field[center-1, center] if center > 0 else 1.0,
+            threat_field[center+1, center] if center < threat_field.shape[0]-1 else 1.0,
+            threat_field[center, center+1] if center < threat_field.shape[1]-1 else 1.0,
+            threat_field[center, center-1] if center > 0 else 1.0
+        ])
         
-        return min(directions, key=directions.get)
+        return self._DIR_ACTIONS[int(threats.argmin())]
     
-    def _find_vegetation_direction(self, perception: Dict[str, Any]) -> Action:
+    def _find_vegetation_direction(self, perception: PhysiologicalPerception, desperation: float) -> Action:
         """Move toward higher vegetation using gradient following."""
-        neighborhood_veg = perception.get("neighborhood_vegetation", None)
-        
-        if neighborhood_veg is None or neighborhood_veg.size == 0:
-            return self.rng.choice([Action.MOVE_NORTH, Action.MOVE_SOUTH, Action.MOVE_EAST, Action.MOVE_WEST])
-        
-        center_y, center_x = neighborhood_veg.shape[0] // 2, neighborhood_veg.shape[1] // 2
-        current_veg = neighborhood_veg[center_y, center_x]
-        
-        directions = {}
-        if center_y > 0:
-            directions[Action.MOVE_NORTH] = neighborhood_veg[center_y - 1, center_x]
-        if center_y < neighborhood_veg.shape[0] - 1:
-            directions[Action.MOVE_SOUTH] = neighborhood_veg[center_y + 1, center_x]
-        if center_x < neighborhood_veg.shape[1] - 1:
-            directions[Action.MOVE_EAST] = neighborhood_veg[center_y, center_x + 1]
-        if center_x > 0:
-            directions[Action.MOVE_WEST] = neighborhood_veg[center_y, center_x - 1]
-        
-        if not directions:
-            return Action.STAY
-        
-        best_direction = max(directions, key=directions.get)
-        
-        # Move toward better vegetation (threshold decreases with desperation)
-        desperation = self.state.internal_state.get("desperation_level", 0.0)
-        gradient_threshold = 0.03 * (1.0 - desperation * 0.7)  # 0.03 -> 0.009 when desperate
-        
-        if directions[best_direction] > current_veg + gradient_threshold:
-            return best_direction
-        else:
-            # When desperate, still follow small gradients; when content, explore randomly
-            if desperation > 0.5:
-                return best_direction  # Follow any upward gradient when desperate
-            else:
-                return self.rng.choice(list(directions.keys()))  # Random when content
+        # Threshold decreases with desperation (0.03 -> 0.009); desperate agents follow any upward gradient
+        return self._follow_gradient(perception.neighborhood_vegetation,
+                                     0.03 * (1.0 - desperation * 0.7), desperation > 0.5)
     
-    def _find_water_direction(self, perception: Dict[str, Any]) -> Action:
+    def _find_water_direction(self, perception: PhysiologicalPerception) -> Action:
         """Move toward higher hydration."""
-        neighborhood_hyd = perception.get("neighborhood_hydration", None)
-        
-        if neighborhood_hyd is None or neighborhood_hyd.size == 0:
-            return self.rng.choice([Action.MOVE_NORTH, Action.MOVE_SOUTH, Action.MOVE_EAST, Action.MOVE_WEST])
-        
-        center_y, center_x = neighborhood_hyd.shape[0] // 2, neighborhood_hyd.shape[1] // 2
-        current_hyd = neighborhood_hyd[center_y, center_x]
-        
-        directions = {}
-        if center_y > 0:
-            directions[Action.MOVE_NORTH] = neighborhood_hyd[center_y - 1, center_x]
-        if center_y < neighborhood_hyd.shape[0] - 1:
-            directions[Action.MOVE_SOUTH] = neighborhood_hyd[center_y + 1, center_x]
-        if center_x < neighborhood_hyd.shape[1] - 1:
-            directions[Action.MOVE_EAST] = neighborhood_hyd[center_y, center_x + 1]
-        if center_x > 0:
-            directions[Action.MOVE_WEST] = neighborhood_hyd[center_y, center_x - 1]
+        return self._follow_gradient(perception.neighborhood_hydration, 0.05, False)
+    
+    def _follow_gradient(self, neighborhood: Optional[np.ndarray], threshold: float, follow_any: bool) -> Action:
+        """Step to the best 4-neighbour when it clears the threshold, else explore randomly."""
+        if neighborhood is None or neighborhood.size == 0:
+            return self._DIR_ACTIONS[self.rng.integers(0, 4)]
         
-        if not directions:
+        code, follow = _gradient_step(neighborhood, threshold, follow_any)
+        if code < 0:
             return Action.STAY
-        
-        best_direction = max(directions, key=directions.get)
-        
-        if directions[best_direction] > current_hyd + 0.05:
-            return best_direction
-        else:
-            return self.rng.choice(list(directions.keys()))
+        if follow:
+            return self._DIR_ACTIONS[code]
+        
+        # Random among the directions present in the (possibly edge-clipped) window
+        h, w = neighborhood.shape
+        cy, cx = h // 2, w // 2
+        keys = _DIRS_BY_MASK[(cy > 0) | (cy < h - 1) << 1 | (cx < w - 1) << 2 | (cx > 0) << 3]
+        return keys[self.rng.integers(0, len(keys))]
     
-    def _get_decay_probabilities(self) -> np.ndarray:
+    def _get_decay_probabilities(self) -> Optional[np.ndarray]:
         """Uniform decay for physiological memories - short-term focus."""
-        if not self.memory:
-            return np.array([])
-        return np.ones(len(self.memory))
+        return None
     
     def _compute_relevance(self, memory: Dict[str, Any], context: Dict[str, Any]) -> float:
         """Relevance based on similar homeostatic states."""
@@ -476,3 +642,184 @@ class PhysiologicalBand(Band):
             relevance *= 1.2
         
         return max(0.0, relevance)
+    
+    def _memory_key(self, memory_entry: Dict[str, Any]) -> float:
+        """Hunger at write time; NaN marks entries without a perception summary."""
+        if "perception_summary" not in memory_entry:
+            return np.nan
+        return memory_entry["perception_summary"].get("hunger", 0.0)
+    
+    def _compute_relevance_batch(self, keys: np.ndarray, affects: np.ndarray,
+                                 context: Dict[str, Any]) -> np.ndarray:
+        """Vectorized form of _compute_relevance over the memory columns."""
+        ctx_hunger = self.state.internal_state.get("hunger", 0.0)
+        relevance = 1.0 - np.abs(keys - ctx_hunger)
+        relevance *= np.where(affects > 0, 1.2, 1.0)
+        np.maximum(relevance, 0.0, out=relevance)
+        relevance[np.isnan(keys)] = 0.0
+        return relevance
+
+class PopulationSlotState(MutableMapping):
+    """
+    internal_state mapping for a band attached to a PhysiologicalPopulation slot.
+    Hot drive keys read and write the population columns; all other keys live in a per-slot dict.
+    """
+    
+    __slots__ = ("population", "slot", "extra")
+    
+    def __init__(self, population: "PhysiologicalPopulation", slot: int, extra: Dict[str, Any]):
+        self.population = population
+        self.slot = slot
+        self.extra = extra
+    
+    def __getitem__(self, key: str) -> Any:
+        column = self.population._arrays.get(key)
+        if column is not None:
+            return column.item(self.slot)
+        if key == "current_focus":
+            code = self.population.focus[self.slot]
+            return PhysiologicalPopulation.FOCUS_NAMES[code] if code >= 0 else None
+        return self.extra[key]
+    
+    def __setitem__(self, key: str, value: Any):
+        column = self.population._arrays.get(key)
+        if column is not None:
+            column[self.slot] = value
+        elif key == "current_focus":
+            self.population.focus[self.slot] = PhysiologicalPopulation.focus_code(value)
+        else:
+            self.extra[key] = value
+    
+    def __delitem__(self, key: str):
+        if key in PhysiologicalPopulation.COLUMNS:
+            raise KeyError(f"Population-backed key {key!r} cannot be deleted")
+        del self.extra[key]
+    
+    def __iter__(self):
+        yield from PhysiologicalPopulation.COLUMNS
+        yield from self.extra
+    
+    def __len__(self) -> int:
+        return len(PhysiologicalPopulation.COLUMNS) + len(self.extra)
+
+class PhysiologicalPopulation:
+    """
+    Struct-of-arrays drive state for a population of Band 1 controllers.
+    
+    Bands attach to a slot (PhysiologicalBand(population=..., slot=...)) and keep working
+    through a PopulationSlotState view, while the population advances many slots at once.
+    compute_urgency mirrors PhysiologicalBand.compute_urgency and apply_action_costs runs the
+    drive updates of update_state, both as parallel Numba kernels over the slot columns.
+    Bands pick up the results through urgency_ready/costs_ready instead of recomputing them.
+    """
+    
+    FOCUS_NAMES = FOCUS_NAMES
+    
+    # internal_state key -> column attribute
+    COLUMNS = {
+        "hunger": "hunger",
+        "thirst": "thirst",
+        "fatigue": "fatigue",
+        "energy": "energy",
+        "current_focus": "focus",
+        "focus_strength": "focus_strength",
+        "ticks_since_satisfaction": "ticks_since_satisfaction",
+        "desperation_level": "desperation",
+        "search_radius": "search_radius",
+        "risk_tolerance": "risk_tolerance",
+    }
+    
+    def __init__(self, capacity: int = 64):
+        capacity = max(capacity, 1)
+        self.n = 0
+        self.hunger = np.zeros(capacity)
+        self.thirst = np.zeros(capacity)
+        self.fatigue = np.zeros(capacity)
+        self.energy = np.zeros(capacity)
+        self.focus = np.full(capacity, -1, dtype=np.int8)  # index into FOCUS_NAMES, -1 for none
+        self.focus_strength = np.zeros(capacity)
+        self.ticks_since_satisfaction = np.zeros(capacity, dtype=np.int64)
+        self.desperation = np.zeros(capacity)
+        self.search_radius = np.zeros(capacity, dtype=np.int32)
+        self.risk_tolerance = np.zeros(capacity)
+        
+        # Urgencies computed ahead of the per-agent loop; the band consumes and clears its ready flag
+        self.urgency = np.zeros(capacity)
+        self.urgency_ready = np.zeros(capacity, dtype=bool)
+        # Same hand-off for action costs applied ahead of the bands' update_state calls
+        self.fed = np.zeros(capacity, dtype=bool)
+        self.costs_ready = np.zeros(capacity, dtype=bool)
+        self.taken = np.zeros(capacity, dtype=bool)
+        self._index_columns()
+    
+    def _index_columns(self):
+        """Map numeric internal_state keys straight to their column arrays for the slot views."""
+        self._arrays = {key: getattr(self, column) for key, column in self.COLUMNS.items() if column != "focus"}
+    
+    @classmethod
+    def focus_code(cls, name: Optional[str]) -> int:
+        return -1 if name is None else _FOCUS_CODES[name]
+    
+    def attach(self, initial_state: Dict[str, Any], slot: Optional[int] = None) -> PopulationSlotState:
+        """Claim a slot (the next free one by default), seed it from initial_state, and return its view."""
+        if slot is None:
+            slot = self.n
+        if slot >= self.hunger.size:
+            self._grow(max(slot + 1, 2 * self.hunger.size))
+        if self.taken[slot]:
+            raise ValueError(f"Population slot {slot} is already attached")
+        self.taken[slot] = True
+        self.n = max(self.n, slot + 1)
+        view = PopulationSlotState(self, slot, {})
+        for key, value in initial_state.items():
+            view[key] = value
+        return view
+    
+    def _grow(self, capacity: int):
+        for column in (*self.COLUMNS.values(), "urgency", "urgency_ready", "fed", "costs_ready", "taken"):
+            old = getattr(self, column)
+            grown = np.full(capacity, -1, dtype=old.dtype) if column == "focus" else np.zeros(capacity, dtype=old.dtype)
+            grown[:old.size] = old
+            setattr(self, column, grown)
+        self._index_columns()
+    
+    def _slot_index(self, slots) -> np.ndarray:
+        return np.arange(self.n) if slots is None else np.asarray(slots, dtype=np.intp)
+    
+    def compute_urgency(self, local_threat: np.ndarray, gain: np.ndarray, slots=None) -> np.ndarray:
+        """
+        Advance the selected slots' drives one tick and return gain-scaled urgencies.
+        The results are parked in urgency/urgency_ready so each attached band's next
+        compute_urgency call picks up its value instead of recomputing it.
+        """
+        B = PhysiologicalBand
+        idx = self._slot_index(slots)
+        urgency = np.empty(idx.size)
+        _tick_drives(idx, self.hunger, self.thirst, self.fatigue, self.focus, self.focus_strength,
+                     self.ticks_since_satisfaction, self.desperation, self.search_radius, self.risk_tolerance,
+                     np.ascontiguousarray(local_threat, dtype=np.float64),
+                     np.ascontiguousarray(gain, dtype=np.float64), urgency,
+                     B.PASSIVE_RATES, B.DRIVE_WEIGHTS,
+                     B.FOCUS_HYSTERESIS_BONUS, B.FOCUS_SWITCH_THRESHOLD, B.FOCUS_BUILDUP_RATE)
+        self.urgency[idx] = urgency
+        self.urgency_ready[idx] = True
+        return urgency
+    
+    def apply_action_costs(self, actions: np.ndarray, local_vegetation: np.ndarray,
+                           local_hydration: np.ndarray, slots=None) -> np.ndarray:
+        """
+        Drive updates of PhysiologicalBand.update_state for Action codes per slot.
+        Returns the mask of successful forages. Each attached band's next update_state call
+        only does its bookkeeping (forage counters, frustration) instead of reapplying the costs.
+        """
+        idx = self._slot_index(slots)
+        fed = np.empty(idx.size, dtype=np.bool_)
+        _apply_action_costs(idx, np.ascontiguousarray(actions, dtype=np.int64),
+                            np.ascontiguousarray(local_vegetation, dtype=np.float64),
+                            np.ascontiguousarray(local_hydration, dtype=np.float64),
+                            self.energy, self.hunger, self.thirst, self.fatigue,
+                            self.ticks_since_satisfaction, fed, _FEED_MASK,
+                            PhysiologicalBand.COST_TABLE)
+        self.fed[idx] = fed
+        self.costs_ready[idx] = True
+        return fed
@@ -1,10 +1,15 @@
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from .band import Band, Action, ActionProposal
-from .band_physiological import PhysiologicalBand
+from .band_physiological import PhysiologicalBand, PhysiologicalPopulation
 from .arbiter import Arbiter
 
+# Actions that relocate the agent (FLEE included), classified once at decision time
+MOVEMENT_ACTIONS = frozenset({
+    Action.MOVE_NORTH, Action.MOVE_SOUTH, Action.MOVE_EAST, Action.MOVE_WEST, Action.FLEE
+})
+
 @dataclass
 class AgentState:
     agent_id: int
@@ -26,6 +31,95 @@ class AgentState:
             "times_caught": self.times_caught
         }
 
+# Action names indexed by Action.value for rebuilding logged decisions
+_ACTION_NAMES = tuple(action.name for action in sorted(Action, key=lambda a: a.value))
+
+class TrajectoryLog:
+    """
+    Columnar per-tick decision log. Rows are appended into preallocated arrays that grow
+    by chunk_size; dicts in the old decision_history format are only built when read.
+    With max_rows set the log is a ring buffer keeping the most recent max_rows decisions
+    (0 disables logging).
+    """
+    
+    def __init__(self, num_bands: int, chunk_size: int = 4096, max_rows: Optional[int] = None):
+        self.chunk_size = chunk_size
+        self.max_rows = max_rows
+        self.length = 0
+        self.start = 0      # Physical row of the oldest entry once the ring has wrapped
+        self.dropped = 0    # Rows overwritten by the ring buffer
+        self.tick = np.empty(0, dtype=np.int32)
+        self.x = np.empty(0, dtype=np.int32)
+        self.y = np.empty(0, dtype=np.int32)
+        self.action = np.empty(0, dtype=np.int8)
+        self.dominant_band = np.empty(0, dtype=np.int8)
+        self.energy = np.empty(0, dtype=np.float64)
+        self.urgencies = np.empty((0, num_bands), dtype=np.float64)
+    
+    def append(self, tick: int, x: int, y: int, action: Action, dominant_band: int,
+               urgencies: List[float], energy: float):
+        i = self.length
+        max_rows = self.max_rows
+        if max_rows is not None and i >= max_rows:
+            if not max_rows:
+                self.dropped += 1
+                return
+            # Full ring: overwrite the oldest row
+            i = self.start
+            self.start = i + 1 if i + 1 < max_rows else 0
+            self.dropped += 1
+        else:
+            if i == self.tick.shape[0]:
+                capacity = i + self.chunk_size
+                self._grow(capacity if max_rows is None else min(capacity, max_rows))
+            self.length = i + 1
+        self.tick[i] = tick
+        self.x[i] = x
+        self.y[i] = y
+        self.action[i] = action.value
+        self.dominant_band[i] = dominant_band
+        self.energy[i] = energy
+        self.urgencies[i] = urgencies
+    
+    def _grow(self, capacity: int):
+        for name in ("tick", "x", "y", "action", "dominant_band", "energy", "urgencies"):
+            old = getattr(self, name)
+            grown = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            grown[:self.length] = old[:self.length]
+            setattr(self, name, grown)
+    
+    def row(self, i: int) -> Dict[str, Any]:
+        """Rebuild logical row i (0 is the oldest kept decision)."""
+        i += self.start
+        if i >= self.length:
+            i -= self.length
+        return {
+            "tick": self.tick.item(i),
+            "position": (self.x.item(i), self.y.item(i)),
+            "action": _ACTION_NAMES[self.action[i]],
+            "dominant_band": self.dominant_band.item(i),
+            "urgencies": self.urgencies[i].tolist(),
+            "energy": self.energy.item(i)
+        }
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [self.row(i) for i in range(self.length)]
+    
+    def __len__(self) -> int:
+        return self.length
+    
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.row(j) for j in range(*i.indices(self.length))]
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError("trajectory index out of range")
+        return self.row(i)
+    
+    def __iter__(self):
+        return (self.row(i) for i in range(self.length))
+
 class BandedAgent:
     """
     Agent with banded controller architecture.
@@ -34,7 +128,9 @@ class BandedAgent:
     """
     
     def __init__(self, agent_id: int, x: int, y: int, initial_energy: float = 100.0, 
-                 seed: int = None, band_seeds: Optional[Dict[int, int]] = None):
+                 seed: int = None, band_seeds: Optional[Dict[int, int]] = None,
+                 population: Optional[PhysiologicalPopulation] = None, slot: Optional[int] = None,
+                 history_limit: Optional[int] = None):
         self.state = AgentState(
             agent_id=agent_id,
             x=x,
@@ -51,20 +147,30 @@ class BandedAgent:
             }
         
         self.bands: List[Band] = [
-            PhysiologicalBand(band_id=1, initial_gain=2.0, seed=band_seeds.get(1))
+            PhysiologicalBand(band_id=1, initial_gain=2.0, seed=band_seeds.get(1),
+                              population=population, slot=slot)
         ]
         
         arbiter_seed = (seed + 2000) if seed is not None else None
         self.arbiter = Arbiter(inertia=0.3, temperature=2.0, seed=arbiter_seed)
         
-        self.decision_history = []
+        # history_limit bounds the decision log to the most recent decisions (0 turns it off)
+        self.decision_history = TrajectoryLog(num_bands=len(self.bands), max_rows=history_limit)
         self.trajectory = []
+        # Lifetime counters, unaffected by history_limit
+        self.decision_count = 0
+        self.movement_count = 0
         
     def step(self, env_state: Dict[str, Any], world_width: int, world_height: int):
         """Execute one timestep: perceive → decide → act → learn."""
         if not self.state.alive:
             return
         
+        self.learn(*self.act(env_state, world_width, world_height))
+    
+    def act(self, env_state: Dict[str, Any], world_width: int,
+            world_height: int) -> Tuple[List[Any], Action, Dict[str, Any]]:
+        """Perceive, decide, move and settle energy; returns (perceptions, action, outcome) for learn."""
         agent_state_dict = {
             "energy": self.state.energy,
             "position": (self.state.x, self.state.y),
@@ -87,20 +193,21 @@ class BandedAgent:
             self.bands, all_proposals, agent_state_dict
         )
         
-        self.decision_history.append({
-            "tick": self.state.tick,
-            "position": (self.state.x, self.state.y),
-            "action": selected_action.name,
-            "dominant_band": dominant_band_id,
-            "urgencies": [band.state.urgency for band in self.bands],
-            "energy": self.state.energy
-        })
+        self.decision_count += 1
+        self.movement_count += selected_action in MOVEMENT_ACTIONS
+        self.decision_history.append(
+            self.state.tick, self.state.x, self.state.y, selected_action, dominant_band_id,
+            [band.state.urgency for band in self.bands], self.state.energy
+        )
         
         old_x, old_y = self.state.x, self.state.y
         self._execute_action(selected_action, world_width, world_height)
         
         outcome = self._compute_outcome(env_state, selected_action, old_x, old_y)
-        
+        return all_perceptions, selected_action, outcome
+    
+    def learn(self, all_perceptions: List[Any], selected_action: Action, outcome: Dict[str, Any]):
+        """Band state updates, learning and memory for the action act() took, then advance the tick."""
         for i, band in enumerate(self.bands):
             perception = all_perceptions[i]
             band.update_state(perception, selected_action, outcome)
@@ -176,8 +283,12 @@ class BandedAgent:
             self.state.alive = False
     
     def get_trajectory(self) -> List[Dict[str, Any]]:
-        """Get complete decision trajectory."""
-        return self.decision_history
+        """
+        Get the logged decision trajectory (the last history_limit decisions when bounded).
+        Its length is not the number of decisions made; use decision_count for that,
+        e.g. as the denominator of movement_count.
+        """
+        return self.decision_history.to_dicts()
     
     def get_band_dominance(self) -> Dict[int, float]:
         """Get distribution of which bands dominated decisions."""
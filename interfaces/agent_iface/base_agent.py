@@ -10,6 +10,12 @@ class Action(Enum):
     MOVE_WEST = 3
     STAY = 4
 
+_ACTIONS = tuple(Action)
+
+# Per-action displacement, indexed by Action.value
+ACTION_DX = np.array([0, 0, 1, -1, 0], dtype=np.int32)
+ACTION_DY = np.array([-1, 1, 0, 0, 0], dtype=np.int32)
+
 @dataclass
 class AgentState:
     agent_id: int
@@ -53,6 +59,72 @@ class Perception:
             "neighborhood_mean_hydration": float(self.neighborhood_hydration.mean())
         }
 
+class PerceptionLog:
+    """
+    Columnar perception history holding the scalars of Perception.to_dict per tick.
+    Neighborhoods are reduced to their means on append, so the log never keeps views
+    into (and with them whole) tick tensors alive.
+    """
+    
+    _FLOAT_COLUMNS = ("local_temperature", "local_hydration", "local_vegetation",
+                      "local_movement_cost", "neighborhood_mean_temp", "neighborhood_mean_hydration")
+    
+    def __init__(self, chunk_size: int = 1024):
+        self.chunk_size = chunk_size
+        self.length = 0
+        for name in self._FLOAT_COLUMNS:
+            setattr(self, name, np.empty(0, dtype=np.float64))
+        self.x = np.empty(0, dtype=np.int32)
+        self.y = np.empty(0, dtype=np.int32)
+        self.tick = np.empty(0, dtype=np.int64)
+    
+    def append(self, perception: "Perception"):
+        i = self.length
+        if i == self.tick.shape[0]:
+            self._grow(i + self.chunk_size)
+        self.local_temperature[i] = perception.local_temperature
+        self.local_hydration[i] = perception.local_hydration
+        self.local_vegetation[i] = perception.local_vegetation
+        self.local_movement_cost[i] = perception.local_movement_cost
+        self.neighborhood_mean_temp[i] = perception.neighborhood_temperature.mean()
+        self.neighborhood_mean_hydration[i] = perception.neighborhood_hydration.mean()
+        self.x[i], self.y[i] = perception.position
+        self.tick[i] = perception.tick
+        self.length = i + 1
+    
+    def _grow(self, capacity: int):
+        for name in self._FLOAT_COLUMNS + ("x", "y", "tick"):
+            old = getattr(self, name)
+            grown = np.empty(capacity, dtype=old.dtype)
+            grown[:self.length] = old[:self.length]
+            setattr(self, name, grown)
+    
+    def row(self, i: int) -> Dict[str, Any]:
+        """Perception.to_dict() of the i-th logged perception."""
+        return {
+            "local_temperature": self.local_temperature.item(i),
+            "local_hydration": self.local_hydration.item(i),
+            "local_vegetation": self.local_vegetation.item(i),
+            "local_movement_cost": self.local_movement_cost.item(i),
+            "position": (self.x.item(i), self.y.item(i)),
+            "tick": self.tick.item(i),
+            "neighborhood_mean_temp": self.neighborhood_mean_temp.item(i),
+            "neighborhood_mean_hydration": self.neighborhood_mean_hydration.item(i)
+        }
+    
+    def __len__(self) -> int:
+        return self.length
+    
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError("perception index out of range")
+        return self.row(i)
+    
+    def __iter__(self):
+        return (self.row(i) for i in range(self.length))
+
 class BaseAgent:
     def __init__(self, agent_id: int, x: int, y: int, initial_energy: float = 100.0, seed: int = None):
         self.state = AgentState(
@@ -63,7 +135,7 @@ class BaseAgent:
             tick=0
         )
         self.rng = np.random.default_rng(seed)
-        self.perception_history = []
+        self.perception_history = PerceptionLog()
         self.action_history = []
         
     def perceive(self, env) -> Perception:
@@ -94,22 +166,8 @@ class BaseAgent:
         raise NotImplementedError("Subclasses must implement decide()")
     
     def execute_action(self, action: Action, world_width: int, world_height: int):
-        dx, dy = 0, 0
-        
-        if action == Action.MOVE_NORTH:
-            dy = -1
-        elif action == Action.MOVE_SOUTH:
-            dy = 1
-        elif action == Action.MOVE_EAST:
-            dx = 1
-        elif action == Action.MOVE_WEST:
-            dx = -1
-        
-        new_x = (self.state.x + dx) % world_width
-        new_y = (self.state.y + dy) % world_height
-        
-        self.state.x = new_x
-        self.state.y = new_y
+        self.state.x = (self.state.x + int(ACTION_DX[action.value])) % world_width
+        self.state.y = (self.state.y + int(ACTION_DY[action.value])) % world_height
     
     def update_energy(self, delta: float):
         self.state.energy += delta
@@ -121,6 +179,21 @@ class BaseAgent:
         if not self.state.alive:
             return
         
+        action, perception = self.act(env, world_width, world_height)
+        
+        energy_cost = self._compute_energy_cost(action, perception)
+        self.update_energy(energy_cost)
+        
+        self.state.tick += 1
+    
+    def act(self, env, world_width: int, world_height: int) -> Tuple[Action, Perception]:
+        """Perceive, decide and move; energy and tick are left to the caller."""
+        action, perception = self.choose(env)
+        self.execute_action(action, world_width, world_height)
+        return action, perception
+    
+    def choose(self, env) -> Tuple[Action, Perception]:
+        """Perceive and decide without moving; the caller applies the action."""
         perception = self.perceive(env)
         action = self.decide(perception)
         
@@ -129,13 +202,7 @@ class BaseAgent:
             "action": action.name,
             "position_before": (self.state.x, self.state.y)
         })
-        
-        self.execute_action(action, world_width, world_height)
-        
-        energy_cost = self._compute_energy_cost(action, perception)
-        self.update_energy(energy_cost)
-        
-        self.state.tick += 1
+        return action, perception
     
     def _compute_energy_cost(self, action: Action, perception: Perception) -> float:
         base_cost = -1.0
@@ -152,30 +219,25 @@ class BaseAgent:
         trajectory = []
         for i, action_record in enumerate(self.action_history):
             if i < len(self.perception_history):
-                perception = self.perception_history[i]
                 trajectory.append({
                     **action_record,
-                    **perception.to_dict()
+                    **self.perception_history.row(i)
                 })
         return trajectory
 
 class RandomAgent(BaseAgent):
     def decide(self, perception: Perception) -> Action:
-        return self.rng.choice(list(Action))
+        return _ACTIONS[self.rng.integers(len(_ACTIONS))]
 
 class GradientAgent(BaseAgent):
     def decide(self, perception: Perception) -> Action:
-        temp_grad = np.gradient(perception.neighborhood_temperature)
-        hydration_grad = np.gradient(perception.neighborhood_hydration)
-        
-        temp_direction = np.argmax(np.abs(temp_grad))
-        hydration_direction = np.argmax(np.abs(hydration_grad))
-        
-        if perception.local_hydration < 0.5:
-            if hydration_grad[hydration_direction] > 0:
-                return Action.MOVE_NORTH if hydration_direction == 0 else Action.MOVE_EAST
-            else:
-                return Action.MOVE_SOUTH if hydration_direction == 0 else Action.MOVE_WEST
-        
-        return Action.STAY
+        if perception.local_hydration >= 0.5:
+            return Action.STAY
+        # Edge-row and edge-column differences of the hydration neighborhood (+y is south)
+        hydration = perception.neighborhood_hydration
+        dy = float(hydration[-1, :].mean() - hydration[0, :].mean())
+        dx = float(hydration[:, -1].mean() - hydration[:, 0].mean())
+        if abs(dy) >= abs(dx):
+            return Action.MOVE_SOUTH if dy > 0 else Action.MOVE_NORTH
+        return Action.MOVE_EAST if dx > 0 else Action.MOVE_WEST
 
@@ -1,11 +1,16 @@
 import numpy as np
-import json
+import orjson
 import os
-from typing import List, Dict, Any, Type
+from typing import List, Dict, Any, Tuple, Type
+from .band import Action
 from .banded_agent import BandedAgent
+from .band_physiological import PhysiologicalPopulation
 from ..ui_iface.runner.agent_api import EnvironmentGrid
 from ..ui_iface.runner.predators import PredatorSystem
 
+# Point fields read into each agent's env_state, with the default for fields the scenario lacks
+_ENV_FIELDS = (("temperature", 0.5), ("hydration", 0.5), ("vegetation", 0.0), ("movement_cost", 0.0))
+
 class AgentSimulation:
     """
     Manages agent-environment simulation with predators.
@@ -26,6 +31,7 @@ class AgentSimulation:
         )
         
         self.agents: List[BandedAgent] = []
+        self.population = PhysiologicalPopulation()
         self.rng = np.random.default_rng(seed)
         self.current_tick = 0
         
@@ -34,9 +40,12 @@ class AgentSimulation:
         
     def spawn_agents(self, num_agents: int, initial_energy: float = 100.0, agent_seed_base: int = 2000):
         """Spawn banded agents at random locations."""
+        integers = self.rng.integers
+        population = self.population
+        agents = self.agents
         for i in range(num_agents):
-            x = self.rng.integers(0, self.world_width)
-            y = self.rng.integers(0, self.world_height)
+            x = integers(0, self.world_width)
+            y = integers(0, self.world_height)
             agent_seed = agent_seed_base + i
             
             agent = BandedAgent(
@@ -44,9 +53,10 @@ class AgentSimulation:
                 x=x,
                 y=y,
                 initial_energy=initial_energy,
-                seed=agent_seed
+                seed=agent_seed,
+                population=population
             )
-            self.agents.append(agent)
+            agents.append(agent)
     
     def step(self):
         """Execute one simulation tick."""
@@ -57,9 +67,15 @@ class AgentSimulation:
         
         self.predators.update(agent_positions, self.current_tick)
         
-        for agent in alive_agents:
-            env_state = self._get_env_state_for_agent(agent)
-            agent.step(env_state, self.world_width, self.world_height)
+        env_states = self._get_env_states(alive_agents)
+        self._advance_band_urgencies(alive_agents, env_states)
+        
+        world_width, world_height = self.world_width, self.world_height
+        pending = [agent.act(env_state, world_width, world_height)
+                   for agent, env_state in zip(alive_agents, env_states)]
+        self._apply_band_action_costs(alive_agents, pending)
+        for agent, (perceptions, action, outcome) in zip(alive_agents, pending):
+            agent.learn(perceptions, action, outcome)
         
         caught_indices = self.predators.check_predation(
             [(a.state.x, a.state.y) for a in alive_agents]
@@ -81,19 +97,65 @@ class AgentSimulation:
         
         self.current_tick += 1
     
+    def _advance_band_urgencies(self, agents: List[BandedAgent], env_states: List[Dict[str, Any]]):
+        """Advance every population-backed agent's physiological drives in one population-wide pass."""
+        population = self.population
+        attached = [k for k, agent in enumerate(agents) if agent.bands and agent.bands[0].population is population]
+        if not attached:
+            return
+        n = len(attached)
+        bands = [agents[k].bands[0] for k in attached]
+        slots = np.fromiter((band.state.internal_state.slot for band in bands), dtype=np.intp, count=n)
+        threat = np.fromiter((env_states[k]["threat"] for k in attached), dtype=np.float64, count=n)
+        gain = np.fromiter((band.state.gain for band in bands), dtype=np.float64, count=n)
+        population.compute_urgency(threat, gain, slots)
+    
+    def _apply_band_action_costs(self, agents: List[BandedAgent], pending: List[Tuple[List[Any], Action, Dict[str, Any]]]):
+        """Apply this tick's physiological action costs for every population-backed agent in one pass."""
+        population = self.population
+        attached = [k for k, agent in enumerate(agents) if agent.bands and agent.bands[0].population is population]
+        if not attached:
+            return
+        n = len(attached)
+        slots = np.fromiter((agents[k].bands[0].state.internal_state.slot for k in attached), dtype=np.intp, count=n)
+        actions = np.fromiter((pending[k][1].value for k in attached), dtype=np.int64, count=n)
+        vegetation = np.fromiter((pending[k][0][0].local_vegetation for k in attached), dtype=np.float64, count=n)
+        hydration = np.fromiter((pending[k][0][0].local_hydration for k in attached), dtype=np.float64, count=n)
+        population.apply_action_costs(actions, vegetation, hydration, slots)
+    
+    def _get_env_states(self, agents: List[BandedAgent]) -> List[Dict[str, Any]]:
+        """Environment states for many agents, reading their cells' fields in one gather."""
+        if not agents:
+            return []
+        n = len(agents)
+        xs = np.fromiter((agent.state.x for agent in agents), dtype=np.intp, count=n)
+        ys = np.fromiter((agent.state.y for agent in agents), dtype=np.intp, count=n)
+        cells = self.env.gather_cells(ys, xs)
+        indices = self.env.registry["indices"]
+        columns = [cells[:, indices[name]].tolist() if name in indices else [default] * n
+                   for name, default in _ENV_FIELDS]
+        columns.append(self.predators.get_threat_at_batch(ys, xs).tolist())
+        env_state = self._env_state
+        return [env_state(agent, *values) for agent, values in zip(agents, zip(*columns))]
+    
     def _get_env_state_for_agent(self, agent: BandedAgent) -> Dict[str, Any]:
         """Get environment state at agent's location including threat."""
         fields = self.env.get_all_fields_at(agent.state.x, agent.state.y)
-        neighborhood = self.env.get_neighborhood(agent.state.x, agent.state.y, radius=2)
-        
         local_threat = self.predators.get_threat_at(agent.state.x, agent.state.y)
-        neighborhood_threat = self.predators.get_local_threat(agent.state.x, agent.state.y, radius=3)
+        return self._env_state(agent, *(fields.get(name, default) for name, default in _ENV_FIELDS), local_threat)
+    
+    def _env_state(self, agent: BandedAgent, temperature: float, hydration: float,
+                   vegetation: float, movement_cost: float, local_threat: float) -> Dict[str, Any]:
+        """Assemble one agent's env_state from its cell values and threat plus the surrounding windows."""
+        x, y = agent.state.x, agent.state.y
+        neighborhood = self.env.get_neighborhood(x, y, radius=2)
+        neighborhood_threat = self.predators.get_local_threat(x, y, radius=3)
         
         return {
-            "temperature": fields.get("temperature", 0.5),
-            "hydration": fields.get("hydration", 0.5),
-            "vegetation": fields.get("vegetation", 0.0),
-            "movement_cost": fields.get("movement_cost", 0.0),
+            "temperature": temperature,
+            "hydration": hydration,
+            "vegetation": vegetation,
+            "movement_cost": movement_cost,
             "threat": local_threat,
             "neighborhood_threat": neighborhood_threat,
             "neighborhood_vegetation": neighborhood.get("vegetation", None),
@@ -122,21 +184,18 @@ class AgentSimulation:
                 "total_predation_events": len(self.predation_events)
             }
         
-        energies = [a.state.energy for a in alive_agents]
+        energies = np.fromiter((a.state.energy for a in alive_agents), dtype=np.float64, count=len(alive_agents))
         
-        band_urgencies = []
-        for agent in alive_agents:
-            if agent.bands:
-                band_urgencies.append(agent.bands[0].state.urgency)
+        band_urgencies = np.fromiter((a.bands[0].state.urgency for a in alive_agents if a.bands), dtype=np.float64)
         
         return {
             "tick": self.current_tick,
             "alive_count": len(alive_agents),
-            "mean_energy": float(np.mean(energies)),
-            "std_energy": float(np.std(energies)),
-            "min_energy": float(np.min(energies)),
-            "max_energy": float(np.max(energies)),
-            "mean_band1_urgency": float(np.mean(band_urgencies)) if band_urgencies else 0.0,
+            "mean_energy": energies.mean(),
+            "std_energy": energies.std(),
+            "min_energy": energies.min(),
+            "max_energy": energies.max(),
+            "mean_band1_urgency": band_urgencies.mean() if band_urgencies.size else 0.0,
             "total_predation_events": len(self.predation_events),
             "predator_threat_mean": self.predators.threat_field.mean()
         }
@@ -158,11 +217,11 @@ class AgentSimulation:
         }
     
     def save_results(self, output_path: str):
-        """Save simulation results to JSON."""
+        """Save simulation results to JSON; numpy scalars and arrays are serialized directly."""
         results = self.get_results()
         
-        with open(output_path, 'w') as f:
-            json.dump(results, f, indent=2)
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2))
     
     def get_survival_rate(self) -> float:
         """Get final survival rate."""
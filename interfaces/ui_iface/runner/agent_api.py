@@ -1,6 +1,8 @@
 import numpy as np
 import json
 import os
+import queue
+import threading
 from .hydrator import hydrate_tick, get_field_index, get_field_names
 from .registry import build_registry
 
@@ -15,10 +17,17 @@ class EnvironmentGrid:
         self.f = len(self.registry["names"])
         self.current_tick = 0
         self.tensor = None
+        # Per-tick caches derived from tensor, rebuilt lazily after each load_tick
+        self._planes = None
+        self._windows = {}
     
-    def load_tick(self, tick: int):
+    def load_tick(self, tick: int, tensor: np.ndarray = None):
         self.current_tick = tick
-        self.tensor = hydrate_tick(self.run_dir, tick)
+        tensor = hydrate_tick(self.run_dir, tick) if tensor is None else tensor
+        # A no-op for hydrated ticks; keeps cell reads and gathers on one float32 C-order layout
+        self.tensor = np.ascontiguousarray(tensor, dtype=np.float32)
+        self._planes = None
+        self._windows = {}
         return self.tensor
     
     def get_field(self, field_name: str) -> np.ndarray:
@@ -31,25 +40,41 @@ class EnvironmentGrid:
         if self.tensor is None:
             raise ValueError("Call load_tick() first")
         idx = self.registry["indices"][field_name]
-        return float(self.tensor[y, x, idx])
+        return self.tensor.item(y, x, idx)
     
     def get_all_fields_at(self, x: int, y: int) -> dict:
         if self.tensor is None:
             raise ValueError("Call load_tick() first")
-        return {name: float(self.tensor[y, x, idx]) 
-                for name, idx in self.registry["indices"].items()}
+        return dict(zip(self.registry["names"], self.tensor[y, x].tolist()))
+    
+    def gather_cells(self, ys: np.ndarray, xs: np.ndarray) -> np.ndarray:
+        """All fields at each (x, y) in one gather: an (N, F) array, columns by registry index."""
+        if self.tensor is None:
+            raise ValueError("Call load_tick() first")
+        return self.tensor[ys, xs]
     
     def get_neighborhood(self, x: int, y: int, radius: int = 1) -> dict:
         if self.tensor is None:
             raise ValueError("Call load_tick() first")
-        y_min = max(0, y - radius)
-        y_max = min(self.h, y + radius + 1)
-        x_min = max(0, x - radius)
-        x_max = min(self.w, x + radius + 1)
-        neighborhood = {}
-        for name, idx in self.registry["indices"].items():
-            neighborhood[name] = self.tensor[y_min:y_max, x_min:x_max, idx]
-        return neighborhood
+        if self._planes is None:
+            self._planes = tuple((name, self.tensor[:, :, idx]) for name, idx in self.registry["indices"].items())
+        rows = slice(max(0, y - radius), min(self.h, y + radius + 1))
+        cols = slice(max(0, x - radius), min(self.w, x + radius + 1))
+        return {name: plane[rows, cols] for name, plane in self._planes}
+    
+    def get_neighborhood_view(self, x: int, y: int, field_idx: int, radius: int = 1) -> np.ndarray:
+        """
+        Toroidal (2r+1, 2r+1) window of one field centred on (x, y), wrapping at the edges like
+        agent movement does. get_neighborhood clips at the edges instead.
+        """
+        if self.tensor is None:
+            raise ValueError("Call load_tick() first")
+        windows = self._windows.get(radius)
+        if windows is None:
+            padded = np.pad(self.tensor, ((radius, radius), (radius, radius), (0, 0)), mode="wrap")
+            windows = np.lib.stride_tricks.sliding_window_view(padded, (2 * radius + 1, 2 * radius + 1), axis=(0, 1))
+            self._windows[radius] = windows
+        return windows[y, x, field_idx]
     
     @property
     def shape(self):
@@ -59,6 +84,56 @@ class EnvironmentGrid:
     def field_names(self):
         return self.registry["names"]
 
+class TickPrefetcher:
+    """Hydrates ticks [start, stop) on a background thread so loading overlaps agent compute."""
+    def __init__(self, run_dir: str, start: int, stop: int, depth: int = 2):
+        self.next_tick = start
+        self.queue = queue.Queue(maxsize=depth)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._worker, args=(run_dir, start, stop), daemon=True)
+        self.thread.start()
+    
+    def _worker(self, run_dir: str, start: int, stop: int):
+        for t in range(start, stop):
+            if self.stop_event.is_set():
+                return
+            try:
+                item = hydrate_tick(run_dir, t)
+            except Exception as e:
+                self._put((t, e))
+                return
+            if not self._put((t, item)):
+                return
+    
+    def _put(self, entry) -> bool:
+        """Block until there is room in the queue or close() is called; False means stopped."""
+        while not self.stop_event.is_set():
+            try:
+                self.queue.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def get(self, tick: int) -> np.ndarray:
+        if tick != self.next_tick:
+            raise ValueError(f"Prefetcher expected tick {self.next_tick}, got {tick}")
+        t, item = self.queue.get()
+        if isinstance(item, Exception):
+            raise item
+        self.next_tick = t + 1
+        return item
+    
+    def close(self):
+        """Stop the worker, drop any hydrated ticks still queued, and wait for the thread to exit."""
+        self.stop_event.set()
+        self.thread.join()
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+
 def get_agent_grid(run_dir: str, tick: int = 0) -> EnvironmentGrid:
     env = EnvironmentGrid(run_dir)
     env.load_tick(tick)
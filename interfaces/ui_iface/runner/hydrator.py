@@ -1,47 +1,75 @@
 import os
 import json
+import functools
 import numpy as np
 import pandas as pd
-from typing import Dict, Any
+import pyarrow.parquet as pq
+from typing import Dict, Any, Tuple
+from .registry import build_registry
+
+# Delta rows scattered per record batch, so peak memory is one batch rather than the whole file
+_REPLAY_BATCH_ROWS = 65536
+_REPLAY_COLUMNS = ["tick", "y", "x", "field_id", "delta"]
+
+def _replay_deltas(tensor: np.ndarray, path: str, tick: int) -> None:
+    """
+    Add every delta row with tick <= `tick` into tensor, in file order. Row groups whose footer
+    statistics start past `tick` are never read; the rest are streamed batch by batch.
+    """
+    pf = pq.ParquetFile(path)
+    metadata = pf.metadata
+    column = metadata.schema.names.index("tick")
+    row_groups = []
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(column).statistics
+        if stats is None or not stats.has_min_max or stats.min <= tick:
+            row_groups.append(i)
+    batches = pf.iter_batches(batch_size=_REPLAY_BATCH_ROWS, row_groups=row_groups,
+                              columns=_REPLAY_COLUMNS)
+    for batch in batches:
+        ticks, y, x, field_id, delta = (batch.column(name).to_numpy() for name in _REPLAY_COLUMNS)
+        keep = ticks <= tick
+        if not keep.all():
+            y, x, field_id, delta = y[keep], x[keep], field_id[keep], delta[keep]
+        # Native delta dtype, so float64 deltas from older runs round once into the float32 tensor
+        np.add.at(tensor, (y.astype(np.intp), x.astype(np.intp), field_id.astype(np.intp)), delta)
+
+@functools.lru_cache(maxsize=32)
+def _load_scenario(scenario_path: str, mtime_ns: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Parsed scenario.json and its registry; keyed on mtime so a rewritten file is parsed again."""
+    with open(scenario_path, "r") as f:
+        cfg = json.load(f)
+    return cfg, build_registry(cfg)
+
+def _run_scenario(run_dir: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Cached (cfg, registry) of a run; shared between callers, so treat both as read-only."""
+    scenario_path = os.path.join(run_dir, "scenario.json")
+    return _load_scenario(scenario_path, os.stat(scenario_path).st_mtime_ns)
 
 def replay_frame(run_dir: str, t: int, h: int, w: int, f: int):
     tensor = np.zeros((h, w, f), dtype=np.float32)
     p = os.path.join(run_dir, "grid", "deltas.parquet")
     if not os.path.exists(p):
         return tensor
-    df = pd.read_parquet(p)
-    df = df[df["tick"] <= t]
-    for _, row in df.iterrows():
-        tensor[int(row["y"]), int(row["x"]), int(row["field_id"])] += float(row["delta"])
+    _replay_deltas(tensor, p, t)
     return tensor
 
 def hydrate_tick(run_dir: str, tick: int) -> np.ndarray:
-    scenario_path = os.path.join(run_dir, "scenario.json")
-    with open(scenario_path, "r") as f:
-        cfg = json.load(f)
+    cfg, registry = _run_scenario(run_dir)
     
     h = cfg["world"]["height"]
     w = cfg["world"]["width"]
     num_fields = len(cfg["fields"])
     
     from .engine import build_seed_partitions, assemble_initial_tensor
-    from .registry import build_registry
     
     seeds = build_seed_partitions(cfg["randomness"]["seed"], cfg["randomness"]["partitions"])
-    registry = build_registry(cfg)
     result = assemble_initial_tensor(cfg, seeds, registry)
     initial_tensor = result["tensor"]
     
     deltas_path = os.path.join(run_dir, "grid", "deltas.parquet")
     if os.path.exists(deltas_path) and tick > 0:
-        df = pd.read_parquet(deltas_path)
-        df = df[df["tick"] <= tick]
-        for _, row in df.iterrows():
-            y = int(row["y"])
-            x = int(row["x"])
-            field_id = int(row["field_id"])
-            delta = float(row["delta"])
-            initial_tensor[y, x, field_id] += delta
+        _replay_deltas(initial_tensor, deltas_path, tick)
     
     for i in range(num_fields):
         lo, hi = registry["bounds"][i]
@@ -49,26 +77,71 @@ def hydrate_tick(run_dir: str, tick: int) -> np.ndarray:
     
     return initial_tensor
 
+class FieldReplay:
+    """
+    One field of a run stepped frame by frame: moving forward applies only the deltas of the ticks
+    since the previous frame instead of replaying the run from tick 0 (moving back restarts).
+    Frames equal hydrate_tick(run_dir, tick)[:, :, field_idx].
+    """
+    def __init__(self, run_dir: str, field_idx: int):
+        _, registry = _run_scenario(run_dir)
+        self.lo, self.hi = registry["bounds"][field_idx]
+        self.initial = hydrate_tick(run_dir, 0)[:, :, field_idx].copy()
+        deltas_path = os.path.join(run_dir, "grid", "deltas.parquet")
+        if os.path.exists(deltas_path):
+            table = pq.read_table(deltas_path, columns=["tick", "y", "x", "delta"],
+                                  filters=[("field_id", "==", field_idx)])
+            ticks = table.column("tick").to_numpy()
+            # Stable, so rows of one tick keep their file order (and summation order)
+            order = np.argsort(ticks, kind="stable") if np.any(ticks[1:] < ticks[:-1]) else slice(None)
+            self.ticks = ticks[order]
+            self.ys = table.column("y").to_numpy().astype(np.intp)[order]
+            self.xs = table.column("x").to_numpy().astype(np.intp)[order]
+            self.deltas = table.column("delta").to_numpy()[order]
+        else:
+            self.ticks = np.empty(0, dtype=np.int64)
+            self.ys = self.xs = np.empty(0, dtype=np.intp)
+            self.deltas = np.empty(0, dtype=np.float32)
+        self.reset()
+    
+    def reset(self):
+        self.plane = self.initial.copy()
+        self.applied = 0
+        self.tick = 0
+    
+    def frame(self, tick: int) -> np.ndarray:
+        if tick < self.tick:
+            self.reset()
+        # hydrate_tick(0) is the initial state; any later tick replays every delta up to it
+        stop = int(np.searchsorted(self.ticks, tick, side="right")) if tick > 0 else 0
+        lo = self.applied
+        if stop > lo:
+            np.add.at(self.plane, (self.ys[lo:stop], self.xs[lo:stop]), self.deltas[lo:stop])
+            self.applied = stop
+        self.tick = tick
+        return np.clip(self.plane, self.lo, self.hi)
+
 def get_field_names(run_dir: str) -> list[str]:
-    scenario_path = os.path.join(run_dir, "scenario.json")
-    with open(scenario_path, "r") as f:
-        cfg = json.load(f)
-    return [field["name"] for field in cfg["fields"]]
+    _, registry = _run_scenario(run_dir)
+    return list(registry["names"])
 
 def get_field_index(run_dir: str, field_name: str) -> int:
-    scenario_path = os.path.join(run_dir, "scenario.json")
-    with open(scenario_path, "r") as f:
-        cfg = json.load(f)
-    for i, field in enumerate(cfg["fields"]):
-        if field["name"] == field_name:
-            return i
+    _, registry = _run_scenario(run_dir)
+    if field_name in registry["indices"]:
+        return registry["indices"][field_name]
     raise ValueError(f"Field '{field_name}' not found")
 
 def get_tick_range(run_dir: str) -> tuple[int, int]:
     deltas_path = os.path.join(run_dir, "grid", "deltas.parquet")
     if not os.path.exists(deltas_path):
         return (0, 0)
-    df = pd.read_parquet(deltas_path)
-    if len(df) == 0:
+    metadata = pq.ParquetFile(deltas_path).metadata
+    if metadata.num_rows == 0:
         return (0, 0)
-    return (0, int(df["tick"].max()))
+    # The max tick comes from the row-group statistics in the footer, without decoding any pages
+    column = metadata.schema.names.index("tick")
+    groups = [metadata.row_group(i) for i in range(metadata.num_row_groups)]
+    stats = [g.column(column).statistics for g in groups if g.num_rows]
+    if all(s is not None and s.has_min_max for s in stats):
+        return (0, int(max(s.max for s in stats)))
+    return (0, int(pd.read_parquet(deltas_path, columns=["tick"])["tick"].max()))
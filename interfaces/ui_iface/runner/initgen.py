@@ -1,6 +1,7 @@
 import numpy as np
 from numpy.typing import NDArray
 from scipy.ndimage import gaussian_filter, distance_transform_edt
+from .kernels import flow_targets, accumulate_flow, priority_flood
 def _rng(seed: int) -> np.random.Generator:
     return np.random.default_rng(seed)
 def _fgauss(h: int, w: int, scale: float, g: np.random.Generator) -> NDArray[np.float32]:
@@ -39,69 +40,14 @@ def precipitation(h: int, w: int, params: dict, seed: int, elevation_raster: NDA
     return p.astype(np.float32)
 def flow_accumulation(E: NDArray[np.float32]) -> tuple[NDArray[np.float32], NDArray[np.bool_]]:
     h, w = E.shape
-    offsets = [(-1,-1),(-1,0),(-1,1),(0,-1),(0,1),(1,-1),(1,0),(1,1)]
-    flow_to = np.zeros((h, w, 2), dtype=np.int32)
-    for y in range(h):
-        for x in range(w):
-            min_e = E[y, x]
-            ty, tx = y, x
-            for dy, dx in offsets:
-                ny = (y + dy) % h
-                nx = (x + dx) % w
-                if E[ny, nx] < min_e:
-                    min_e = E[ny, nx]
-                    ty, tx = ny, nx
-            flow_to[y, x, 0] = ty
-            flow_to[y, x, 1] = tx
-    indeg = np.zeros((h, w), dtype=np.int32)
-    for y in range(h):
-        for x in range(w):
-            ty, tx = flow_to[y, x]
-            if ty != y or tx != x:
-                indeg[ty, tx] += 1
-    from collections import deque
-    q = deque()
-    for y in range(h):
-        for x in range(w):
-            if indeg[y, x] == 0:
-                q.append((y, x))
-    acc = np.ones((h, w), dtype=np.float32)
-    visited = np.zeros((h, w), dtype=np.bool_)
-    while q:
-        y, x = q.popleft()
-        visited[y, x] = True
-        ty, tx = flow_to[y, x]
-        if ty == y and tx == x:
-            continue
-        acc[ty, tx] += acc[y, x]
-        indeg[ty, tx] -= 1
-        if indeg[ty, tx] == 0:
-            q.append((ty, tx))
-    closed = ~visited
-    return acc, closed
+    acc, visited = accumulate_flow(flow_targets(E))
+    closed = ~visited.reshape(h, w)
+    return acc.reshape(h, w), closed
 def lakes(E: NDArray[np.float32], A: NDArray[np.float32], threshold: float) -> tuple[NDArray[np.bool_], NDArray[np.float32]]:
     h, w = E.shape
     mask = np.zeros((h, w), dtype=np.bool_)
     filled = E.copy()
-    border = []
-    for y in range(h):
-        for x in range(w):
-            if y in (0, h-1) or x in (0, w-1):
-                border.append((E[y, x], y, x))
-    import heapq
-    heapq.heapify(border)
-    water = np.full((h, w), np.inf, dtype=np.float32)
-    while border:
-        e, y, x = heapq.heappop(border)
-        if water[y, x] <= e:
-            continue
-        water[y, x] = e
-        for dy, dx in [(-1,0),(1,0),(0,-1),(0,1)]:
-            ny = (y + dy) % h
-            nx = (x + dx) % w
-            we = max(e, E[ny, nx])
-            if we < water[ny, nx]:
-                heapq.heappush(border, (we, ny, nx))
+    water = priority_flood(E)
     lake_level = water
     lake_mask = lake_level > E
     inc = np.percentile(A, 100.0 * (1.0 - threshold))
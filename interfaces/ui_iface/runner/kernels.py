@@ -1,5 +1,5 @@
 import numpy as np
-from numba import njit
+from numba import njit, prange
 @njit(cache=True, fastmath=True)
 def laplacian5(arr, wrapx, wrapy):
     h, w = arr.shape
@@ -41,63 +41,315 @@ def advect(arr, vx, vy, wrapx, wrapy):
             v11 = arr[y1, x1]
             out[y, x] = (1 - sx) * (1 - sy) * v00 + sx * (1 - sy) * v10 + (1 - sx) * sy * v01 + sx * sy * v11
     return out
-def step_kernels(tensor, cfg, registry, wrapx, wrapy, noise_rng):
-    names = registry["names"]
-    coeffs = registry["coeffs"]
-    derived = registry["derived"]
-    h, w, f = tensor.shape
-    new = tensor.copy()
-    for i in range(f):
-        if derived[i]:
+@njit(cache=True, fastmath=True)
+def coherence_sum(arr, m):
+    h, w = arr.shape
+    acc = 0.0
+    for y in range(h):
+        up = arr[(y - 1 + h) % h]
+        row = arr[y]
+        down = arr[(y + 1) % h]
+        # Wrapped columns 0 and w-1 first, then the interior without index arithmetic
+        s = (row[0] - m) * (row[w - 1] + row[1 % w] + up[0] + down[0] - 4.0 * m)
+        if w > 1:
+            s += (row[w - 1] - m) * (row[w - 2] + row[0] + up[w - 1] + down[w - 1] - 4.0 * m)
+        for x in range(1, w - 1):
+            s += (row[x] - m) * (row[x - 1] + row[x + 1] + up[x] + down[x] - 4.0 * m)
+        acc += s
+    return acc
+def kernel_params(cfg, registry):
+    """Flatten the per-field coefficients and profile constants step_kernels reads every tick."""
+    indices = registry["indices"]
+    fields = []
+    for i, c in enumerate(registry["coeffs"]):
+        if registry["derived"][i]:
             continue
-        c = coeffs[i]
+        adv = c.get("advection", {})
+        lo, hi = registry["bounds"][i]
+        fields.append((i, float(c.get("diffusion", 0.0)), float(adv.get("vx", 0.0)), float(adv.get("vy", 0.0)),
+                       float(c.get("decay", 0.0)), float(c.get("replenish", 0.0)), lo, hi))
+    t_idx = indices.get("temperature", None)
+    h_idx = indices.get("hydration", None)
+    v_idx = indices.get("vegetation", None)
+    veg = None
+    if v_idx is not None and h_idx is not None and t_idx is not None:
+        vp = cfg["vegetation_profile"]
+        veg = (float(vp.get("k", 0.08)), float(vp.get("water_half", 0.35)), float(vp.get("heat_optimum", 0.65)),
+               float(vp.get("heat_sigma", 0.18)), float(vp.get("carrying_capacity", 1.0)))
+    # float32 copies of every constant the fused reaction kernel applies, so it rounds like numpy does
+    react = (np.array([i for i, *_ in fields], dtype=np.int64),
+             np.array([1.0 - dec for *_, dec, _, _, _ in fields], dtype=np.float32),
+             np.array([dec != 0.0 for *_, dec, _, _, _ in fields], dtype=np.bool_),
+             np.array([rep for *_, rep, _, _ in fields], dtype=np.float32),
+             np.array([rep != 0.0 for *_, rep, _, _ in fields], dtype=np.bool_),
+             np.array([lo for *_, lo, _ in fields], dtype=np.float32),
+             np.array([hi for *_, hi in fields], dtype=np.float32))
+    veg32 = np.zeros(5, dtype=np.float32)
+    if veg is not None:
+        k, water_half, _, _, K = veg
+        veg32[:] = (k, water_half, 1e-8, K + 1e-8, 0.5)
+    return {"fields": fields, "t_idx": t_idx, "h_idx": h_idx, "v_idx": v_idx, "veg": veg,
+            "mc_idx": indices.get("movement_cost", None), "react": react, "veg32": veg32,
+            "evap32": np.float32(0.005), "mc32": np.array([0.3, 0.5, 0.2], dtype=np.float32)}
+@njit(cache=True, parallel=True)
+def react_fused(new, t_idx, h_idx, v_idx, mc_idx, st, evap, veg32, mc32,
+                field_idx, one_minus_dec, has_dec, rep, has_rep, lo, hi):
+    """
+    Every pointwise pass of step_kernels after transport, fused into one sweep over the cells:
+    evaporation, vegetation growth against hydration (st is the precomputed heat suitability),
+    per-field decay/replenish/bounds clipping, then movement cost. Indices of -1 skip a pass.
+    All arithmetic stays in float32 in numpy's operation order, and clipping keeps numpy's
+    semantics, so results are bit-identical to the whole-plane passes. No fastmath: contraction
+    into FMAs would change the rounding.
+    """
+    h, w, _ = new.shape
+    zero = np.float32(0.0)
+    one = np.float32(1.0)
+    do_evap = t_idx >= 0 and h_idx >= 0
+    do_veg = do_evap and v_idx >= 0 and st.shape[0] == h
+    do_mc = mc_idx >= 0 and h_idx >= 0 and v_idx >= 0
+    k, water_half, eps, K8, half = veg32[0], veg32[1], veg32[2], veg32[3], veg32[4]
+    for y in prange(h):
+        for x in range(w):
+            if do_evap:
+                T = new[y, x, t_idx]
+                if T <= zero:
+                    T = zero
+                if T >= one:
+                    T = one
+                H = new[y, x, h_idx] - evap * T
+                if H <= zero:
+                    H = zero
+                if H >= one:
+                    H = one
+                new[y, x, h_idx] = H
+            if do_veg:
+                H = new[y, x, h_idx]
+                V = new[y, x, v_idx]
+                sw = H / (H + water_half + eps)
+                growth = k * V * (one - V / K8) * sw * st[y, x]
+                V = V + growth
+                if V <= zero:
+                    V = zero
+                if V >= one:
+                    V = one
+                H = H - half * growth
+                if H <= zero:
+                    H = zero
+                if H >= one:
+                    H = one
+                new[y, x, v_idx] = V
+                new[y, x, h_idx] = H
+            for j in range(field_idx.shape[0]):
+                i = field_idx[j]
+                v = new[y, x, i]
+                if has_dec[j]:
+                    v = v * one_minus_dec[j]
+                if has_rep[j]:
+                    v = v + rep[j]
+                    if v <= zero:
+                        v = zero
+                    if v >= one:
+                        v = one
+                if v <= lo[j]:
+                    v = lo[j]
+                if v >= hi[j]:
+                    v = hi[j]
+                new[y, x, i] = v
+            if do_mc:
+                mc = mc32[0] + mc32[1] * new[y, x, v_idx] + mc32[2] * (one - new[y, x, h_idx])
+                if mc <= zero:
+                    mc = zero
+                if mc >= one:
+                    mc = one
+                new[y, x, mc_idx] = mc
+_NO_PLANE = np.zeros((0, 0), dtype=np.float32)
+def _index(i):
+    return -1 if i is None else i
+def step_kernels(tensor, cfg, registry, wrapx, wrapy, noise_rng, params=None, out=None):
+    if params is None:
+        params = kernel_params(cfg, registry)
+    h, w, f = tensor.shape
+    # The next state is built in `out` when given (a buffer the caller reuses), else in a fresh copy
+    if out is None:
+        new = tensor.copy()
+    else:
+        new = out
+        np.copyto(new, tensor)
+    for i, d, vx, vy, _, _, _, _ in params["fields"]:
         arr = new[:, :, i]
-        d = float(c.get("diffusion", 0.0))
         if d != 0.0:
             arr = arr + d * laplacian5(arr, wrapx, wrapy)
-        adv = c.get("advection", {})
-        vx = float(adv.get("vx", 0.0))
-        vy = float(adv.get("vy", 0.0))
         if vx != 0.0 or vy != 0.0:
             arr = advect(arr, vx, vy, wrapx, wrapy)
         new[:, :, i] = arr
-    t_idx = registry["indices"].get("temperature", None)
-    h_idx = registry["indices"].get("hydration", None)
-    v_idx = registry["indices"].get("vegetation", None)
-    if t_idx is not None and h_idx is not None:
-        evap = 0.005
-        new[:, :, h_idx] = np.clip(new[:, :, h_idx] - evap * np.clip(new[:, :, t_idx], 0.0, 1.0), 0.0, 1.0)
-    if v_idx is not None and h_idx is not None and t_idx is not None:
-        k = float(cfg["vegetation_profile"].get("k", 0.08))
-        water_half = float(cfg["vegetation_profile"].get("water_half", 0.35))
-        opt = float(cfg["vegetation_profile"].get("heat_optimum", 0.65))
-        sigma = float(cfg["vegetation_profile"].get("heat_sigma", 0.18))
-        K = float(cfg["vegetation_profile"].get("carrying_capacity", 1.0))
-        H = new[:, :, h_idx]
-        T = new[:, :, t_idx]
-        V = new[:, :, v_idx]
-        sw = H / (H + water_half + 1e-8)
-        st = np.exp(-0.5 * ((T - opt) / (sigma + 1e-8)) ** 2)
-        growth = k * V * (1.0 - V / (K + 1e-8)) * sw * st
-        consume = 0.5 * growth
-        new[:, :, v_idx] = np.clip(V + growth, 0.0, 1.0)
-        new[:, :, h_idx] = np.clip(H - consume, 0.0, 1.0)
-    for i in range(f):
-        if derived[i]:
-            continue
-        c = registry["coeffs"][i]
-        dec = float(c.get("decay", 0.0))
-        rep = float(c.get("replenish", 0.0))
-        if dec != 0.0:
-            new[:, :, i] = new[:, :, i] * (1.0 - dec)
-        if rep != 0.0:
-            new[:, :, i] = np.clip(new[:, :, i] + rep, 0.0, 1.0)
-        lo, hi = registry["bounds"][i]
-        new[:, :, i] = np.clip(new[:, :, i], lo, hi)
-    if "movement_cost" in names:
-        idx = registry["indices"]["movement_cost"]
-        hi = new[:, :, registry["indices"]["hydration"]] if "hydration" in names else np.zeros((h, w))
-        ve = new[:, :, registry["indices"]["vegetation"]] if "vegetation" in names else np.zeros((h, w))
+    t_idx = params["t_idx"]
+    h_idx = params["h_idx"]
+    v_idx = params["v_idx"]
+    idx = params["mc_idx"]
+    if params["veg"] is not None:
+        # Heat suitability stays a numpy pass: numpy's float32 exp is not bit-identical to libm's
+        _, _, opt, sigma, _ = params["veg"]
+        st = np.exp(-0.5 * ((new[:, :, t_idx] - opt) / (sigma + 1e-8)) ** 2)
+    else:
+        st = _NO_PLANE
+    react_fused(new, _index(t_idx), _index(h_idx), _index(v_idx), _index(idx), st, params["evap32"],
+                params["veg32"], params["mc32"], *params["react"])
+    if idx is not None and (h_idx is None or v_idx is None):
+        hi = new[:, :, h_idx] if h_idx is not None else np.zeros((h, w))
+        ve = new[:, :, v_idx] if v_idx is not None else np.zeros((h, w))
         mc = np.clip(0.3 + 0.5 * ve + 0.2 * (1.0 - hi), 0.0, 1.0)
         new[:, :, idx] = mc
     return new
+@njit(cache=True)
+def flow_targets(E):
+    """
+    Flat index of each cell's D8 steepest-descent neighbour on the torus (itself when no neighbour
+    is lower). Offsets are scanned row by row from (-1, -1) and ties keep the first, as before.
+    Serial on purpose: hydrate_tick reaches this from TickPrefetcher's worker thread, and a
+    parallel region launched off the main thread hangs interpreter exit under the TBB layer.
+    """
+    h, w = E.shape
+    flow = np.empty(h * w, dtype=np.int64)
+    for y in range(h):
+        ym = y - 1 if y > 0 else h - 1
+        yp = y + 1 if y < h - 1 else 0
+        for x in range(w):
+            xm = x - 1 if x > 0 else w - 1
+            xp = x + 1 if x < w - 1 else 0
+            min_e = E[y, x]
+            ty = y
+            tx = x
+            if E[ym, xm] < min_e:
+                min_e = E[ym, xm]
+                ty, tx = ym, xm
+            if E[ym, x] < min_e:
+                min_e = E[ym, x]
+                ty, tx = ym, x
+            if E[ym, xp] < min_e:
+                min_e = E[ym, xp]
+                ty, tx = ym, xp
+            if E[y, xm] < min_e:
+                min_e = E[y, xm]
+                ty, tx = y, xm
+            if E[y, xp] < min_e:
+                min_e = E[y, xp]
+                ty, tx = y, xp
+            if E[yp, xm] < min_e:
+                min_e = E[yp, xm]
+                ty, tx = yp, xm
+            if E[yp, x] < min_e:
+                min_e = E[yp, x]
+                ty, tx = yp, x
+            if E[yp, xp] < min_e:
+                min_e = E[yp, xp]
+                ty, tx = yp, xp
+            flow[y * w + x] = ty * w + tx
+    return flow
+@njit(cache=True)
+def accumulate_flow(flow):
+    """
+    Upstream cell count along flow targets, in topological (FIFO) order from the sources, in float32.
+    Cells never dequeued sit on closed flow cycles; returns (acc, visited) over flat indices.
+    """
+    n = flow.shape[0]
+    indeg = np.zeros(n, dtype=np.int32)
+    for i in range(n):
+        if flow[i] != i:
+            indeg[flow[i]] += 1
+    # Each cell is enqueued at most once, when its in-degree reaches zero
+    queue = np.empty(n, dtype=np.int64)
+    tail = 0
+    for i in range(n):
+        if indeg[i] == 0:
+            queue[tail] = i
+            tail += 1
+    acc = np.ones(n, dtype=np.float32)
+    visited = np.zeros(n, dtype=np.bool_)
+    head = 0
+    while head < tail:
+        i = queue[head]
+        head += 1
+        visited[i] = True
+        t = flow[i]
+        if t == i:
+            continue
+        acc[t] += acc[i]
+        indeg[t] -= 1
+        if indeg[t] == 0:
+            queue[tail] = t
+            tail += 1
+    return acc, visited
+@njit(cache=True)
+def _heap_push(keys, items, size, key, item):
+    """Push (key, item) onto the binary min-heap held in keys[:size]/items[:size]; returns the new size."""
+    i = size
+    while i > 0:
+        parent = (i - 1) >> 1
+        if keys[parent] <= key:
+            break
+        keys[i] = keys[parent]
+        items[i] = items[parent]
+        i = parent
+    keys[i] = key
+    items[i] = item
+    return size + 1
+@njit(cache=True)
+def _heap_pop(keys, items, size):
+    """Pop the minimum of the heap in keys[:size]/items[:size]; returns (key, item, new size)."""
+    key = keys[0]
+    item = items[0]
+    size -= 1
+    last_key = keys[size]
+    last_item = items[size]
+    i = 0
+    while True:
+        child = 2 * i + 1
+        if child >= size:
+            break
+        if child + 1 < size and keys[child + 1] < keys[child]:
+            child += 1
+        if keys[child] >= last_key:
+            break
+        keys[i] = keys[child]
+        items[i] = items[child]
+        i = child
+    keys[i] = last_key
+    items[i] = last_item
+    return key, item, size
+@njit(cache=True)
+def priority_flood(E):
+    """
+    Spill level of every cell: the lowest possible maximum elevation along a 4-connected path from
+    the grid's edge cells, with neighbours wrapping at the edges. Float32 levels are selected
+    elevations, never computed, so the result does not depend on heap tie order.
+    """
+    h, w = E.shape
+    n = h * w
+    water = np.full(n, np.inf, dtype=np.float32)
+    # Edge cells plus at most four pushes per settled cell
+    capacity = 4 * n + 2 * (h + w)
+    keys = np.empty(capacity, dtype=np.float32)
+    items = np.empty(capacity, dtype=np.int64)
+    size = 0
+    for y in range(h):
+        for x in range(w):
+            if y == 0 or y == h - 1 or x == 0 or x == w - 1:
+                size = _heap_push(keys, items, size, E[y, x], y * w + x)
+    while size > 0:
+        e, i, size = _heap_pop(keys, items, size)
+        if water[i] <= e:
+            continue
+        water[i] = e
+        y = i // w
+        x = i - y * w
+        ym = y - 1 if y > 0 else h - 1
+        yp = y + 1 if y < h - 1 else 0
+        xm = x - 1 if x > 0 else w - 1
+        xp = x + 1 if x < w - 1 else 0
+        for ny, nx in ((ym, x), (yp, x), (y, xm), (y, xp)):
+            j = ny * w + nx
+            we = max(e, E[ny, nx])
+            if we < water[j]:
+                size = _heap_push(keys, items, size, we, j)
+    return water.reshape(h, w)
@@ -18,6 +18,8 @@ class PredatorSystem:
         self.predators: List[Predator] = []
         self.rng = np.random.default_rng(seed)
         self.threat_field = np.zeros((world_height, world_width), dtype=np.float32)
+        # Circular threat stamps by threat radius, built on first use
+        self._stamps: Dict[int, np.ndarray] = {}
         
         for i in range(num_predators):
             x = self.rng.integers(0, world_width)
@@ -37,37 +39,41 @@ class PredatorSystem:
         """Update predator positions and threat field."""
         self.threat_field.fill(0.0)
         
-        for predator in self.predators:
+        # Targets depend only on where each predator starts the tick, so they are found all at once
+        targets = self._closest_agents(agent_positions)
+        
+        for predator, target in zip(self.predators, targets):
             if not predator.active:
                 continue
             
-            closest_agent = self._find_closest_agent(predator, agent_positions)
-            
-            if closest_agent is not None:
-                self._move_toward(predator, closest_agent)
+            if target >= 0:
+                self._move_toward(predator, agent_positions[target])
             else:
                 self._random_patrol(predator)
             
             self._update_threat_field(predator)
     
-    def _find_closest_agent(self, predator: Predator, agent_positions: List[Tuple[int, int]]) -> Tuple[int, int]:
-        """Find closest agent within hunt radius."""
-        if not agent_positions:
-            return None
-        
-        min_dist = float('inf')
-        closest = None
-        
-        for ax, ay in agent_positions:
-            dx = min(abs(ax - predator.x), self.world_width - abs(ax - predator.x))
-            dy = min(abs(ay - predator.y), self.world_height - abs(ay - predator.y))
-            dist = np.sqrt(dx**2 + dy**2)
-            
-            if dist < min_dist and dist <= predator.hunt_radius:
-                min_dist = dist
-                closest = (ax, ay)
+    def _closest_agents(self, agent_positions: List[Tuple[int, int]]) -> List[int]:
+        """
+        Per predator, the index of the closest agent within its hunt radius (the first on ties),
+        or -1 when there is none. Compares squared toroidal distances for all pairs at once.
+        """
+        if not agent_positions or not self.predators:
+            return [-1] * len(self.predators)
+        agents = np.asarray(agent_positions, dtype=np.int64)
+        px = np.array([p.x for p in self.predators], dtype=np.int64)
+        py = np.array([p.y for p in self.predators], dtype=np.int64)
+        r2 = np.array([p.hunt_radius for p in self.predators], dtype=np.int64) ** 2
         
-        return closest
+        dx = np.abs(agents[None, :, 0] - px[:, None])
+        dy = np.abs(agents[None, :, 1] - py[:, None])
+        dx = np.minimum(dx, self.world_width - dx)
+        dy = np.minimum(dy, self.world_height - dy)
+        d2 = dx * dx + dy * dy
+        d2 = np.where(d2 <= r2[:, None], d2, np.iinfo(np.int64).max)
+        closest = d2.argmin(axis=1)
+        in_range = d2[np.arange(len(self.predators)), closest] <= r2
+        return np.where(in_range, closest, -1).tolist()
     
     def _move_toward(self, predator: Predator, target: Tuple[int, int]):
         """Move predator toward target."""
@@ -99,24 +105,33 @@ class PredatorSystem:
         predator.x = (predator.x + dx) % self.world_width
         predator.y = (predator.y + dy) % self.world_height
     
+    def _threat_stamp(self, threat_radius: int) -> np.ndarray:
+        """(2r+1, 2r+1) float32 threat falloff 1 - dist / r inside the radius, 0 outside."""
+        stamp = self._stamps.get(threat_radius)
+        if stamp is None:
+            d = np.arange(-threat_radius, threat_radius + 1)
+            dist = np.sqrt(d[:, None] ** 2 + d[None, :] ** 2)
+            stamp = np.where(dist <= threat_radius, np.maximum(0.0, 1.0 - dist / threat_radius), 0.0).astype(np.float32)
+            self._stamps[threat_radius] = stamp
+        return stamp
+    
     def _update_threat_field(self, predator: Predator):
         """Update threat field with predator influence."""
-        threat_radius = predator.hunt_radius + 5
-        
-        for dy in range(-threat_radius, threat_radius + 1):
-            for dx in range(-threat_radius, threat_radius + 1):
-                x = (predator.x + dx) % self.world_width
-                y = (predator.y + dy) % self.world_height
-                
-                dist = np.sqrt(dx**2 + dy**2)
-                if dist <= threat_radius:
-                    threat = max(0.0, 1.0 - dist / threat_radius)
-                    self.threat_field[y, x] = max(self.threat_field[y, x], threat)
+        threat_radius = int(predator.hunt_radius) + 5
+        offsets = np.arange(-threat_radius, threat_radius + 1)
+        ys = (predator.y + offsets) % self.world_height
+        xs = (predator.x + offsets) % self.world_width
+        # Unbuffered max, so a stamp wider than the world still takes the max where it wraps onto itself
+        np.maximum.at(self.threat_field, (ys[:, None], xs[None, :]), self._threat_stamp(threat_radius))
     
     def get_threat_at(self, x: int, y: int) -> float:
         """Get threat level at position."""
         return float(self.threat_field[y, x])
     
+    def get_threat_at_batch(self, ys: np.ndarray, xs: np.ndarray) -> np.ndarray:
+        """Threat level at each (x, y) in one gather: an (N,) array."""
+        return self.threat_field[ys, xs]
+    
     def get_local_threat(self, x: int, y: int, radius: int = 3) -> np.ndarray:
         """Get threat field in local neighborhood."""
         y_min = max(0, y - radius)
@@ -128,22 +143,19 @@ class PredatorSystem:
     
     def check_predation(self, agent_positions: List[Tuple[int, int]]) -> List[int]:
         """Check which agents are caught by predators (return agent indices)."""
-        caught_indices = []
-        
-        for i, (ax, ay) in enumerate(agent_positions):
-            for predator in self.predators:
-                if not predator.active:
-                    continue
-                
-                dx = min(abs(ax - predator.x), self.world_width - abs(ax - predator.x))
-                dy = min(abs(ay - predator.y), self.world_height - abs(ay - predator.y))
-                dist = np.sqrt(dx**2 + dy**2)
-                
-                if dist <= 1.0:
-                    caught_indices.append(i)
-                    break
+        active = [(p.x, p.y) for p in self.predators if p.active]
+        if not agent_positions or not active:
+            return []
+        agents = np.asarray(agent_positions, dtype=np.int64)
+        predators = np.asarray(active, dtype=np.int64)
         
-        return caught_indices
+        # (agents, predators) toroidal offsets; caught means within distance 1 of any predator
+        dx = np.abs(agents[:, 0, None] - predators[None, :, 0])
+        dy = np.abs(agents[:, 1, None] - predators[None, :, 1])
+        dx = np.minimum(dx, self.world_width - dx)
+        dy = np.minimum(dy, self.world_height - dy)
+        caught = (dx * dx + dy * dy <= 1).any(axis=1)
+        return np.flatnonzero(caught).tolist()
     
     def get_state(self) -> Dict[str, Any]:
         """Get current predator system state."""
@@ -105,20 +105,20 @@ def create_animation(run_dir: str, field_name: str, output_path: str = None, max
         print(f"Field {field_name} not found in run")
         return
     
-    from .hydrator import get_tick_range
+    from .hydrator import get_tick_range, FieldReplay
     min_tick, max_tick = get_tick_range(run_dir)
     max_tick = min(max_tick, max_frames - 1)
     
     fig, ax = plt.subplots(figsize=(10, 8))
     cmap = create_colormap(field_name)
-    tensor = hydrate_tick(run_dir, 0)
-    im = ax.imshow(tensor[:, :, field_idx], cmap=cmap, origin='lower', vmin=0, vmax=1)
+    # Frames advance one tick of deltas at a time instead of re-hydrating the run per frame
+    replay = FieldReplay(run_dir, field_idx)
+    im = ax.imshow(replay.frame(0), cmap=cmap, origin='lower', vmin=0, vmax=1)
     plt.colorbar(im, label=field_name)
     title = ax.set_title(f"{field_name.title()} - Tick 0")
     
     def animate(frame):
-        tensor = hydrate_tick(run_dir, frame)
-        im.set_array(tensor[:, :, field_idx])
+        im.set_array(replay.frame(frame))
         title.set_text(f"{field_name.title()} - Tick {frame}")
         return im, title
     
@@ -2,7 +2,7 @@ import pytest
 import numpy as np
 import os
 import tempfile
-from interfaces.ui_iface.runner.agent_api import EnvironmentGrid, get_agent_grid
+from interfaces.ui_iface.runner.agent_api import EnvironmentGrid, TickPrefetcher, get_agent_grid
 from interfaces.ui_iface.runner.engine import load_scenario, run_headless
 
 @pytest.fixture
@@ -63,6 +63,18 @@ def test_get_all_fields_at(test_run):
     assert "movement_cost" in fields
     assert all(0.0 <= v <= 1.0 for v in fields.values())
 
+def test_gather_cells_matches_get_all_fields_at(test_run):
+    env = EnvironmentGrid(test_run)
+    env.load_tick(0)
+    
+    xs = np.array([0, 100, 255])
+    ys = np.array([7, 100, 3])
+    cells = env.gather_cells(ys, xs)
+    assert cells.shape == (3, env.f)
+    for row, x, y in zip(cells, xs, ys):
+        fields = env.get_all_fields_at(int(x), int(y))
+        assert {name: float(row[idx]) for name, idx in env.registry["indices"].items()} == fields
+
 def test_get_neighborhood(test_run):
     env = EnvironmentGrid(test_run)
     env.load_tick(0)
@@ -72,6 +84,22 @@ def test_get_neighborhood(test_run):
     assert "temperature" in neighborhood
     assert neighborhood["temperature"].shape == (5, 5)
 
+def test_get_neighborhood_view_wraps(test_run):
+    env = EnvironmentGrid(test_run)
+    env.load_tick(0)
+    idx = env.registry["indices"]["hydration"]
+    
+    view = env.get_neighborhood_view(128, 128, idx, radius=2)
+    assert np.array_equal(view, env.get_neighborhood(128, 128, radius=2)["hydration"])
+    
+    plane = env.get_field("hydration")
+    corner = np.roll(np.roll(plane, 2, axis=0), 2, axis=1)[:5, :5]
+    assert np.array_equal(env.get_neighborhood_view(0, 0, idx, radius=2), corner)
+    
+    env.load_tick(1)
+    assert np.array_equal(env.get_neighborhood_view(128, 128, idx, radius=2),
+                          env.get_neighborhood(128, 128, radius=2)["hydration"])
+
 def test_get_agent_grid(test_run):
     env = get_agent_grid(test_run, tick=0)
     assert env.tensor is not None
@@ -107,3 +135,14 @@ def test_shape_property(test_run):
     env = EnvironmentGrid(test_run)
     assert env.shape == (256, 256, 4)
 
+def test_tick_prefetcher_matches_load_tick(test_run):
+    env = EnvironmentGrid(test_run)
+    prefetcher = TickPrefetcher(test_run, 0, 1)
+    
+    assert np.array_equal(prefetcher.get(0), env.load_tick(0))
+    
+    with pytest.raises(ValueError, match="expected tick 1"):
+        prefetcher.get(5)
+    
+    prefetcher.close()
+    assert not prefetcher.thread.is_alive()
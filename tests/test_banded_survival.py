@@ -1,9 +1,10 @@
 import pytest
 import tempfile
 import numpy as np
-from interfaces.agent_iface.banded_agent import BandedAgent
+from interfaces.agent_iface.banded_agent import BandedAgent, TrajectoryLog
+from interfaces.agent_iface.band import Action
 from interfaces.agent_iface.simulation import AgentSimulation
-from interfaces.agent_iface.band_physiological import PhysiologicalBand
+from interfaces.agent_iface.band_physiological import PhysiologicalBand, PhysiologicalPopulation, gather_windows
 from interfaces.ui_iface.runner.engine import load_scenario, run_headless
 from interfaces.ui_iface.runner.predators import PredatorSystem
 
@@ -111,6 +112,21 @@ def test_predator_catches_agent():
     
     assert 0 in caught
 
+def test_predator_catches_across_wrap_and_batches_threat():
+    predators = PredatorSystem(world_width=64, world_height=64, num_predators=2, seed=42)
+    predators.predators[0].x, predators.predators[0].y = 0, 10
+    predators.predators[1].x, predators.predators[1].y = 30, 30
+    predators.predators[1].active = False
+    
+    agent_positions = [(63, 10), (30, 30), (0, 12), (1, 10)]
+    assert predators.check_predation(agent_positions) == [0, 3]
+    assert predators.check_predation([]) == []
+    
+    predators.update(agent_positions, tick=0)
+    xs = np.array([x for x, _ in agent_positions])
+    ys = np.array([y for _, y in agent_positions])
+    assert predators.get_threat_at_batch(ys, xs).tolist() == [predators.get_threat_at(x, y) for x, y in agent_positions]
+
 def test_agent_simulation_creation(test_env):
     sim = AgentSimulation(test_env, num_predators=3, seed=42)
     assert sim.world_width == 256
@@ -133,6 +149,21 @@ def test_agent_simulation_step(test_env):
     assert sim.current_tick == 1
     assert len(sim.population_stats) == 1
 
+def test_agent_simulation_steps_unattached_agents(test_env):
+    sim = AgentSimulation(test_env, num_predators=2, seed=42)
+    sim.spawn_agents(num_agents=3, initial_energy=100.0)
+    other = PhysiologicalPopulation()
+    sim.agents.append(BandedAgent(agent_id=3, x=10, y=10, initial_energy=100.0, seed=7))
+    sim.agents.append(BandedAgent(agent_id=4, x=20, y=20, initial_energy=100.0, seed=8, population=other))
+    
+    for _ in range(3):
+        sim.step()
+    
+    assert sim.current_tick == 3
+    assert len(sim.agents[3].decision_history) == 3
+    assert len(sim.agents[4].decision_history) == 3
+    assert other.n == 1 and sim.population.n == 3
+
 def test_agent_simulation_run(test_env):
     sim = AgentSimulation(test_env, num_predators=3, seed=42)
     sim.spawn_agents(num_agents=10, initial_energy=120.0)
@@ -176,3 +207,114 @@ def test_agent_dies_from_predation():
     assert agent.state.energy == 0.0
     assert agent.state.alive is False
 
+def test_physiological_population_matches_scalar():
+    rng = np.random.default_rng(0)
+    population = PhysiologicalPopulation(capacity=8)
+    scalar = [PhysiologicalBand(seed=i) for i in range(50)]
+    attached = [PhysiologicalBand(seed=i, population=population) for i in range(50)]
+    assert population.n == 50
+    for a, b in zip(scalar, attached):
+        drives = {"hunger": rng.random(), "thirst": rng.random(), "fatigue": rng.random()}
+        a.state.internal_state.update(drives)
+        b.state.internal_state.update(drives)
+    
+    gain = np.array([b.state.gain for b in attached])
+    for _ in range(20):
+        threat = rng.random(50) * 0.3
+        for band, t in zip(scalar, threat):
+            band.compute_urgency(band.perceive({"threat": t}, {}))
+        urgency = population.compute_urgency(threat, gain)
+    
+    for a, b, u in zip(scalar, attached, urgency):
+        assert a.state.urgency == u
+        assert a.state.internal_state == dict(b.state.internal_state)
+
+def test_physiological_population_action_costs_match_update_state():
+    rng = np.random.default_rng(1)
+    population = PhysiologicalPopulation()
+    scalar = [PhysiologicalBand(seed=i) for i in range(40)]
+    attached = [PhysiologicalBand(seed=i, population=population) for i in range(40)]
+    for a, b in zip(scalar, attached):
+        drives = {"hunger": rng.random(), "thirst": rng.random(), "fatigue": rng.random(), "energy": 100 * rng.random()}
+        a.state.internal_state.update(drives)
+        b.state.internal_state.update(drives)
+    
+    actions = rng.integers(0, 8, size=40)
+    veg = rng.random(40)
+    hyd = rng.random(40)
+    for band, action, v, h in zip(scalar, actions, veg, hyd):
+        band.update_state(band.perceive({"vegetation": v, "hydration": h}, {}), Action(int(action)), {})
+    population.apply_action_costs(actions, veg, hyd)
+    
+    for a, b in zip(scalar, attached):
+        for key in ("hunger", "thirst", "fatigue", "energy", "ticks_since_satisfaction"):
+            assert a.state.internal_state[key] == b.state.internal_state[key]
+    
+    # The bands' own update_state then only does the bookkeeping on top of the applied costs
+    for band, action, v, h in zip(attached, actions, veg, hyd):
+        band.update_state(band.perceive({"vegetation": v, "hydration": h}, {}), Action(int(action)), {})
+    assert not population.costs_ready.any()
+    for a, b in zip(scalar, attached):
+        assert a.state.internal_state == dict(b.state.internal_state)
+
+def test_physiological_population_rejects_shared_slot():
+    population = PhysiologicalPopulation()
+    PhysiologicalBand(population=population, slot=3)
+    with pytest.raises(ValueError):
+        PhysiologicalBand(population=population, slot=3)
+
+def test_trajectory_log_grows_and_rebuilds_rows():
+    log = TrajectoryLog(num_bands=1, chunk_size=2)
+    for t in range(5):
+        log.append(t, t, 2 * t, Action.FORAGE if t % 2 else Action.STAY, 1, [0.5 * t], 100.0 - t)
+    
+    assert len(log) == 5
+    assert log[-1] == {"tick": 4, "position": (4, 8), "action": "STAY", "dominant_band": 1,
+                       "urgencies": [2.0], "energy": 96.0}
+    assert [row["action"] for row in log.to_dicts()] == ["STAY", "FORAGE", "STAY", "FORAGE", "STAY"]
+
+def test_trajectory_log_ring_keeps_latest_rows():
+    log = TrajectoryLog(num_bands=1, chunk_size=2, max_rows=3)
+    for t in range(7):
+        log.append(t, t, t, Action.STAY, 1, [0.0], 100.0)
+    
+    assert len(log) == 3
+    assert log.dropped == 4
+    assert [row["tick"] for row in log] == [4, 5, 6]
+    assert log[0]["tick"] == 4 and log[-1]["tick"] == 6
+    
+    off = TrajectoryLog(num_bands=1, max_rows=0)
+    off.append(0, 0, 0, Action.STAY, 1, [0.0], 100.0)
+    assert len(off) == 0 and off.to_dicts() == []
+
+def test_bounded_history_keeps_lifetime_decision_count():
+    agent = BandedAgent(agent_id=0, x=128, y=128, initial_energy=100.0, seed=42, history_limit=2)
+    env_state = {
+        "temperature": 0.5,
+        "hydration": 0.8,
+        "vegetation": 0.4,
+        "movement_cost": 0.0,
+        "threat": 0.0,
+        "neighborhood_threat": np.zeros((5, 5))
+    }
+    
+    for _ in range(5):
+        agent.step(env_state, world_width=256, world_height=256)
+    
+    assert len(agent.decision_history) == 2
+    assert agent.decision_count == 5
+    assert agent.movement_count <= agent.decision_count
+
+def test_gather_windows_matches_torus_slices():
+    rng = np.random.default_rng(3)
+    field = rng.random((12, 9))
+    xs = rng.integers(0, 9, size=20)
+    ys = rng.integers(0, 12, size=20)
+    out = np.empty((32, 5, 5))
+    
+    windows = gather_windows(np.pad(field, 2, mode="wrap"), xs, ys, 2, out)
+    
+    assert windows.shape == (20, 5, 5)
+    for window, x, y in zip(windows, xs, ys):
+        expected = field[np.ix_(np.arange(y - 2, y + 3) % 12, np.arange(x - 2, x + 3) % 9)]
+        assert np.array_equal(window, expected)
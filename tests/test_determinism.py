@@ -3,7 +3,7 @@ import numpy as np
 import tempfile
 import os
 from interfaces.ui_iface.runner.engine import load_scenario, run_headless
-from interfaces.ui_iface.runner.hydrator import hydrate_tick
+from interfaces.ui_iface.runner.hydrator import hydrate_tick, replay_frame, get_tick_range, FieldReplay
 
 def test_deterministic_initialization():
     scenario_path = "interfaces/ui_iface/scenarios/env-b.yaml"
@@ -65,6 +65,33 @@ def test_scenario_hash_consistency():
     
     assert hash1 == hash2, "Scenario hash must be consistent"
 
+def test_tick_range_and_filtered_replay():
+    import pandas as pd
+    scenario_path = "interfaces/ui_iface/scenarios/env-b.yaml"
+    cfg = load_scenario(scenario_path)
+    h, w, f = cfg["world"]["height"], cfg["world"]["width"], len(cfg["fields"])
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        run_dir = run_headless(cfg, ticks=3, out_dir=tmpdir, label="replay")
+        assert get_tick_range(run_dir) == (0, 2)
+        
+        df = pd.read_parquet(os.path.join(run_dir, "grid", "deltas.parquet"))
+        rows = df[df["tick"] <= 1]
+        expected = np.zeros((h, w, f), dtype=np.float32)
+        for y, x, field_id, delta in zip(rows["y"], rows["x"], rows["field_id"], rows["delta"]):
+            expected[y, x, field_id] += delta
+        assert np.array_equal(replay_frame(run_dir, 1, h, w, f), expected)
+
+def test_field_replay_frames_match_hydrate_tick():
+    scenario_path = "interfaces/ui_iface/scenarios/env-b.yaml"
+    cfg = load_scenario(scenario_path)
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        run_dir = run_headless(cfg, ticks=4, out_dir=tmpdir, label="frames")
+        replay = FieldReplay(run_dir, 1)
+        for tick in [0, 1, 2, 3, 1, 3]:
+            assert np.array_equal(replay.frame(tick), hydrate_tick(run_dir, tick)[:, :, 1])
+
 def test_numerical_stability():
     scenario_path = "interfaces/ui_iface/scenarios/env-b.yaml"
     cfg = load_scenario(scenario_path)
@@ -1,8 +1,9 @@
 import pytest
 import tempfile
 import os
-from interfaces.agent_iface.base_agent import BaseAgent, RandomAgent, GradientAgent, Action, AgentState, Perception
-from interfaces.agent_iface.agent_manager import AgentManager
+import numpy as np
+from interfaces.agent_iface.base_agent import BaseAgent, RandomAgent, GradientAgent, Action, AgentState, Perception, PerceptionLog
+from interfaces.agent_iface.agent_manager import AgentManager, masked_population_moments
 from interfaces.ui_iface.runner.engine import load_scenario, run_headless
 
 @pytest.fixture
@@ -131,6 +132,57 @@ def test_agent_manager_simulation(test_env):
     assert manager.current_tick == 10
     assert manager.get_alive_count() >= 0
 
+def test_agent_manager_follows_agent_state_and_overrides(test_env):
+    class FlatCostAgent(RandomAgent):
+        def _compute_energy_cost(self, action, perception):
+            return -10.0
+    
+    manager = AgentManager(test_env, seed=42)
+    manager.spawn_agents(RandomAgent, num_agents=2, initial_energy=100.0)
+    manager.agents.append(FlatCostAgent(agent_id=2, x=10, y=10, initial_energy=100.0, seed=1))
+    manager.agents[0].state.alive = False
+    manager.step()
+    assert manager.agents[0].state.tick == 0
+    assert manager.agents[2].state.tick == 1
+    assert manager.agents[2].state.energy == 90.0
+    
+    manager.agents[0].state.alive = True
+    manager.step()
+    assert manager.agents[0].state.tick == 1
+    assert manager.get_alive_count() == 3
+
+def test_agent_manager_save_trajectories(test_env, tmp_path):
+    manager = AgentManager(test_env, seed=42, record_trajectories=True)
+    manager.spawn_agents(RandomAgent, num_agents=4, initial_energy=100.0)
+    manager.step()
+    
+    out = tmp_path / "trajectories.npz"
+    manager.save_trajectories_npz(str(out))
+    
+    data = np.load(out)
+    assert data["positions"].shape == (1, 4, 2)
+    assert data["energies"].shape == (1, 4)
+    assert data["ticks"].tolist() == [0]
+    assert data["positions"][0].tolist() == [[a.state.x, a.state.y] for a in manager.agents]
+    assert np.allclose(data["energies"][0], [a.state.energy for a in manager.agents])
+    
+    manager.save_trajectories(str(tmp_path / "trajectories.json"))
+    assert (tmp_path / "trajectories.json").exists()
+    with pytest.raises(ValueError):
+        AgentManager(test_env, seed=42).save_trajectories_npz(str(tmp_path / "empty.npz"))
+
+def test_masked_population_moments():
+    energies = np.full(6, 37.3)
+    xs = np.arange(6, dtype=np.int32)
+    ys = xs * 2
+    mask = np.array([True, False, True, True, False, True])
+    
+    n, mean_e, std_e, min_e, max_e, mean_x, mean_y = masked_population_moments(energies, xs, ys, mask)
+    assert n == 4
+    assert mean_e == 37.3 and std_e == 0.0
+    assert min_e == max_e == 37.3
+    assert mean_x == xs[mask].mean() and mean_y == ys[mask].mean()
+
 def test_agent_trajectory_recording(test_env):
     from interfaces.ui_iface.runner.agent_api import EnvironmentGrid
     
@@ -160,3 +212,48 @@ def test_gradient_agent(test_env):
     
     assert isinstance(action, Action)
 
+def test_perception_log_rows_match_to_dict():
+    rng = np.random.default_rng(0)
+    log = PerceptionLog(chunk_size=2)
+    perceptions = []
+    for t in range(5):
+        p = Perception(
+            local_temperature=float(rng.random()),
+            local_hydration=float(rng.random()),
+            local_vegetation=float(rng.random()),
+            local_movement_cost=0.0,
+            neighborhood_temperature=rng.random((5, 5)).astype(np.float32),
+            neighborhood_hydration=rng.random((5, 5)).astype(np.float32),
+            neighborhood_vegetation=rng.random((5, 5)).astype(np.float32),
+            position=(t, 2 * t),
+            tick=t
+        )
+        perceptions.append(p)
+        log.append(p)
+    
+    assert len(log) == 5
+    assert [row for row in log] == [p.to_dict() for p in perceptions]
+    assert log[-1] == perceptions[-1].to_dict()
+
+def test_gradient_agent_moves_up_hydration_when_dry():
+    agent = GradientAgent(agent_id=0, x=10, y=10, initial_energy=100.0, seed=0)
+    rows = np.tile(np.linspace(0.0, 1.0, 5, dtype=np.float32)[:, None], (1, 5))
+    
+    def perception(hydration, local_hydration):
+        return Perception(
+            local_temperature=0.5,
+            local_hydration=local_hydration,
+            local_vegetation=0.0,
+            local_movement_cost=0.0,
+            neighborhood_temperature=np.zeros((5, 5), dtype=np.float32),
+            neighborhood_hydration=hydration,
+            neighborhood_vegetation=np.zeros((5, 5), dtype=np.float32),
+            position=(10, 10),
+            tick=0
+        )
+    
+    assert agent.decide(perception(rows, 0.2)) == Action.MOVE_SOUTH
+    assert agent.decide(perception(rows[::-1], 0.2)) == Action.MOVE_NORTH
+    assert agent.decide(perception(rows.T, 0.2)) == Action.MOVE_EAST
+    assert agent.decide(perception(rows.T[:, ::-1], 0.2)) == Action.MOVE_WEST
+    assert agent.decide(perception(rows, 0.8)) == Action.STAY